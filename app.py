@@ -1,21 +1,32 @@
 """FastAPI application for ship route optimization"""
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
+from sqlalchemy import select, func, text, union, case, or_, and_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
-import json
+from typing import List, Optional, Tuple
+import asyncio
+import copy
+import hashlib
+import httpx
+import logging
+import orjson
 import numpy as np
 from shapely.geometry import Polygon
-from datetime import datetime, timedelta
-import subprocess
+from datetime import datetime, timedelta, date
 import os
+import random
+import re
+import subprocess
 import sys
-import sqlite3
+import time
+from functools import lru_cache
 
 from database import (
-    get_db, ShipRoute as DBShipRoute, Ship as DBShip,
+    get_db, get_async_db, async_engine, ShipRoute as DBShipRoute, Ship as DBShip,
     ShipRealtimeLocation as DBShipRealtimeLocation,
     CCTVDevice as DBCCTVDevice, LiDARDevice as DBLiDARDevice,
     WeatherData as DBWeatherData, SOSAlert as DBSOSAlert,
@@ -31,14 +42,21 @@ from models import (
 )
 from eum_api_client import EUMAPIClient
 from core_optimizer_latlng import (
-    ShipRoute, RouteOptimizer
+    ShipRoute, RouteOptimizer, ObstaclePolygon, build_obstacle_index,
+    path_segment_distances, path_distance_nm, ships_near_path, FleetExtents
 )
 from chatbot_service import ChatbotService
 from weather_service import WeatherService
 from ship001_routes import SHIP001_ROUTES
 
 
-app = FastAPI(title="Ship Navigation Optimizer", version="1.0.0")
+logger = logging.getLogger(__name__)
+
+app = FastAPI(
+    title="Ship Navigation Optimizer",
+    version="1.0.0",
+    default_response_class=ORJSONResponse
+)
 
 # CORS middleware
 app.add_middleware(
@@ -53,31 +71,73 @@ app.add_middleware(
 route_optimizer = None
 obstacles_latlng = []  # Obstacles in lat/lng coordinates
 eum_client = None
+eum_http = None
 chatbot_service = None
 weather_service = None
 
+# Last successful upstream responses, served with ETag/Cache-Control while fresh
+LIDAR_STATS_TTL_SECONDS = 2.0
+lidar_stats_cache = {"body": None, "etag": None, "fetched_at": 0.0}
+WEATHER_TTL_SECONDS = 60.0
+weather_cache = {"body": None, "etag": None, "fetched_at": 0.0}
+
+# Coordinate system base point (top-left corner of map)
+MAP_ORIGIN_LAT = 35.993654  # Top-left latitude
+MAP_ORIGIN_LNG = 129.549146  # Top-left longitude
+PIXEL_SCALE = 0.00001  # Degrees per pixel
+
+# Hardcoded EUM001 route: reversed EUM010 path, docking -> fishing area
+EUM001_PATH = (
+    (35.985810, 129.553259),  # Docking
+    (35.985210, 129.557459),
+    (35.985010, 129.558059),
+    (35.985610, 129.558659),
+    (35.986210, 129.560259),
+    (35.982610, 129.570659)   # Fishing area
+)
+EUM001_DEPARTURE = EUM001_PATH
+EUM001_ARRIVAL = EUM001_PATH[::-1]
+# Same length in both directions
+EUM001_DISTANCE_NM = path_distance_nm(EUM001_PATH)
+
+# Frontend SHIP IDs -> EUM IDs
+SHIP_TO_EUM_ID = {f'SHIP{n:03d}': f'EUM{n:03d}' for n in range(1, 11)}
+
+
+def pixels_to_lat_lng(pixel_coords) -> np.ndarray:
+    """Convert (x, y) pixel coordinates to an (N, 2) array of (lat, lng)"""
+    coords = np.asarray(pixel_coords, dtype=np.float64).reshape(-1, 2)
+    return np.column_stack([
+        MAP_ORIGIN_LAT - coords[:, 1] * PIXEL_SCALE,  # Y increases downward
+        MAP_ORIGIN_LNG + coords[:, 0] * PIXEL_SCALE   # X increases rightward
+    ])
+
+
+def lat_lng_to_pixel(lat: float, lng: float) -> Tuple[float, float]:
+    """Convert a lat/lng position to (x, y) pixel coordinates"""
+    return (lng - MAP_ORIGIN_LNG) / PIXEL_SCALE, (MAP_ORIGIN_LAT - lat) / PIXEL_SCALE
+
+
+def lat_lng_to_pixels(lat_lng_coords) -> np.ndarray:
+    """Convert (lat, lng) positions to an (N, 2) array of (x, y) pixel coordinates"""
+    coords = np.asarray(lat_lng_coords, dtype=np.float64).reshape(-1, 2)
+    return np.column_stack([
+        (coords[:, 1] - MAP_ORIGIN_LNG) / PIXEL_SCALE,
+        (MAP_ORIGIN_LAT - coords[:, 0]) / PIXEL_SCALE
+    ])
+
 
 def load_obstacles_from_json(json_file='guryongpo_obstacles_drawn.json'):
     """Load obstacles from JSON file and convert to lat/lng"""
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    with open(json_file, 'rb') as f:
+        data = orjson.loads(f.read())
 
-    obstacles = []
-    for item in data:
+    # Create ObstaclePolygon object instead of plain Polygon
+    obstacles = [
         # Original coordinates are in pixels, convert to lat/lng
-        pixel_coords = item['polygon']
-        latlng_coords = []
-        for x, y in pixel_coords:
-            # Convert from pixel to lat/lng using MAP_ORIGIN as reference
-            # Assuming 1 pixel = ~0.00001 degrees (adjust as needed)
-            lat = MAP_ORIGIN['lat'] - (y * 0.00001)  # Y increases downward
-            lng = MAP_ORIGIN['lng'] + (x * 0.00001)  # X increases rightward
-            latlng_coords.append((lat, lng))
-
-        # Create ObstaclePolygon object instead of plain Polygon
-        from core_optimizer_latlng import ObstaclePolygon
-        obstacle = ObstaclePolygon(vertices=latlng_coords)
-        obstacles.append(obstacle)
+        ObstaclePolygon(vertices=pixels_to_lat_lng(item['polygon']).tolist())
+        for item in data
+    ]
 
     return obstacles
 
@@ -85,27 +145,46 @@ def load_obstacles_from_json(json_file='guryongpo_obstacles_drawn.json'):
 @app.on_event("startup")
 async def startup_event():
     """Initialize optimization components on startup"""
-    global route_optimizer, obstacles_latlng, eum_client, chatbot_service, weather_service
+    global route_optimizer, obstacles_latlng, eum_client, eum_http, chatbot_service, weather_service
 
     print("🚀 Starting Ship Navigation System...")
 
     # Check if database needs initialization
     db = next(get_db())
     try:
-        ship_count = db.query(DBShip).count()
-        cctv_count = db.query(DBCCTVDevice).count()
-        lidar_count = db.query(DBLiDARDevice).count()
+        # Single round-trip for all three table counts
+        ship_count, cctv_count, lidar_count = db.execute(select(
+            select(func.count()).select_from(DBShip).scalar_subquery(),
+            select(func.count()).select_from(DBCCTVDevice).scalar_subquery(),
+            select(func.count()).select_from(DBLiDARDevice).scalar_subquery()
+        )).one()
 
         # If any table is empty, initialize all data
         if ship_count == 0 or cctv_count == 0 or lidar_count == 0:
             print("📊 Database is empty. Initializing with hardcoded data...")
-            # Run initialization script
-            result = subprocess.run([sys.executable, "init_all_data.py"], capture_output=True, text=True)
-            if result.returncode == 0:
-                print("✅ Database initialized successfully")
-                print(result.stdout)
+            # Device tables are seeded inline from the hardcoded lists
+            device_fields = ('id', 'name', 'latitude', 'longitude', 'address')
+            if cctv_count == 0:
+                db.bulk_insert_mappings(DBCCTVDevice, [
+                    {field: device[field] for field in device_fields} for device in CCTV_DATA
+                ])
+            if lidar_count == 0:
+                db.bulk_insert_mappings(DBLiDARDevice, [
+                    {field: device[field] for field in device_fields} for device in LIDAR_DATA
+                ])
+
+            db.commit()
+
+            # Ships come from the init script, run the same way start_backend.sh does
+            if ship_count == 0:
+                result = subprocess.run([sys.executable, "init_all_data.py"], capture_output=True, text=True)
+                if result.returncode == 0:
+                    print("✅ Database initialized successfully")
+                    print(result.stdout)
+                else:
+                    print(f"❌ Failed to initialize database: {result.stderr}")
             else:
-                print(f"❌ Failed to initialize database: {result.stderr}")
+                print("✅ Database initialized successfully")
         else:
             print(f"✅ Database already contains data:")
             print(f"   - Ships: {ship_count}")
@@ -119,14 +198,22 @@ async def startup_event():
     # Load obstacles in lat/lng format
     obstacles_latlng = load_obstacles_from_json()
 
+    # Build the obstacle spatial index once; rebuilt only when obstacles change
+    obstacle_index = build_obstacle_index(obstacles_latlng)
+
     # Initialize lat/lng-based route optimizer
     route_optimizer = RouteOptimizer(
-        obstacles=obstacles_latlng
+        obstacles=obstacles_latlng,
+        obstacle_index=obstacle_index
     )
+    _find_path.cache_clear()
 
     # Initialize EUM API client
     eum_client = EUMAPIClient()
 
+    # Shared keep-alive HTTP client for async EUM API calls
+    eum_http = httpx.AsyncClient(verify=False, timeout=5.0)
+
     # Initialize chatbot service
     chatbot_service = ChatbotService()
 
@@ -139,42 +226,61 @@ async def startup_event():
     print("✅ Ship Navigation Optimizer initialized")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release shared HTTP and database connections"""
+    if eum_http is not None:
+        await eum_http.aclose()
+    await async_engine.dispose()
+
+
 async def sync_ship_list():
     """Sync ship list from EUM API to database (disabled - using hardcoded data)"""
     # This function is now disabled since we're using hardcoded data
     # Keep it for future use if we want to sync with real API
     return
 
-    global eum_client
     db = next(get_db())
 
     try:
         ships = eum_client.get_ship_list()
-        for ship_data in ships:
-            # Check if ship exists
-            existing = db.query(DBShip).filter(
-                DBShip.ship_id == ship_data['shipId']
-            ).first()
-
-            if not existing:
-                db_ship = DBShip(
-                    ship_id=ship_data['shipId'],
-                    name=ship_data['name'],
-                    type=ship_data['type'],
-                    pol=ship_data['pol'],
-                    pol_addr=ship_data['polAddr'],
-                    length=ship_data['length'],
-                    breath=ship_data['breath'],
-                    depth=ship_data['depth'],
-                    gt=ship_data['gt']
-                )
-                db.add(db_ship)
-            else:
-                # Update existing ship
-                existing.name = ship_data['name']
-                existing.type = ship_data['type']
-                existing.updated_at = datetime.utcnow()
 
+        # Fetch which ships already exist in one query instead of one per ship
+        ids = [ship_data['shipId'] for ship_data in ships]
+        existing = {
+            ship_id: row_id for ship_id, row_id in db.execute(
+                select(DBShip.ship_id, DBShip.id).where(DBShip.ship_id.in_(ids))
+            )
+        }
+
+        now = datetime.utcnow()
+        to_insert = [
+            {
+                "ship_id": ship_data['shipId'],
+                "name": ship_data['name'],
+                "type": ship_data['type'],
+                "pol": ship_data['pol'],
+                "pol_addr": ship_data['polAddr'],
+                "length": ship_data['length'],
+                "breath": ship_data['breath'],
+                "depth": ship_data['depth'],
+                "gt": ship_data['gt']
+            }
+            for ship_data in ships if ship_data['shipId'] not in existing
+        ]
+        # Update existing ships
+        to_update = [
+            {
+                "id": existing[ship_data['shipId']],
+                "name": ship_data['name'],
+                "type": ship_data['type'],
+                "updated_at": now
+            }
+            for ship_data in ships if ship_data['shipId'] in existing
+        ]
+
+        db.bulk_insert_mappings(DBShip, to_insert)
+        db.bulk_update_mappings(DBShip, to_update)
         db.commit()
         print(f"Synced {len(ships)} ships from EUM API")
     except Exception as e:
@@ -183,83 +289,304 @@ async def sync_ship_list():
         db.close()
 
 
-def get_existing_ships(db: Session, exclude_ship_id: str = None) -> List[ShipRoute]:
-    """Get all active ships from database"""
-    query = db.query(DBShipRoute).filter(
-        DBShipRoute.status.in_(['accepted', 'active'])
-    )
+# Simulation-table routes parsed for collision avoidance, reused until the table changes
+simulation_ships_cache = {"stamp": None, "ships": [], "extents": None}
 
-    if exclude_ship_id:
-        query = query.filter(DBShipRoute.ship_id != exclude_ship_id)
+# Decoded simulation-table rows served by the /api/simulation endpoints,
+# plus the same routes stacked into arrays for position updates
+simulation_routes_cache = {"stamp": None, "routes": [], "fleet": None, "by_ship": {}, "schedules": None}
 
-    db_ships = query.all()
-    ships = []
+# Aggregates over ship_routes_simulation that change on INSERT, DELETE and in-place UPDATE
+# (e.g. optimize_departure_times.py rewriting departure/arrival times); weighting by
+# rowid keeps a swap of values between two rows from cancelling out
+SIMULATION_STAMP_COLUMNS = """
+    COUNT(*), COALESCE(MAX(rowid), 0),
+    total(rowid * julianday(departure_time)), total(rowid * julianday(arrival_time)),
+    total(rowid * length(path)), total(rowid * speed_knots), total(rowid * total_distance_nm)
+"""
 
-    for db_ship in db_ships:
-        # Get path - if it's in pixel format, convert to lat/lng
-        path_data = db_ship.get_path()
-        path_latlng = []
-        for point in path_data:
-            if isinstance(point, (list, tuple)) and len(point) == 2:
-                # Check if it's already lat/lng (values in typical range)
-                if 35 <= point[0] <= 37 and 129 <= point[1] <= 131:
-                    path_latlng.append(point)
-                else:
-                    # Convert from pixel to lat/lng
-                    lat = MAP_ORIGIN['lat'] - (point[1] * 0.00001)
-                    lng = MAP_ORIGIN['lng'] + (point[0] * 0.00001)
-                    path_latlng.append((lat, lng))
-
-        # Get start and goal in lat/lng
-        start_lat = db_ship.start_lat if hasattr(db_ship, 'start_lat') and db_ship.start_lat else \
-                   MAP_ORIGIN['lat'] - (db_ship.start_y * 0.00001)
-        start_lng = db_ship.start_lng if hasattr(db_ship, 'start_lng') and db_ship.start_lng else \
-                   MAP_ORIGIN['lng'] + (db_ship.start_x * 0.00001)
-        goal_lat = db_ship.goal_lat if hasattr(db_ship, 'goal_lat') and db_ship.goal_lat else \
-                  MAP_ORIGIN['lat'] - (db_ship.goal_y * 0.00001)
-        goal_lng = db_ship.goal_lng if hasattr(db_ship, 'goal_lng') and db_ship.goal_lng else \
-                  MAP_ORIGIN['lng'] + (db_ship.goal_x * 0.00001)
 
-        ship = ShipRoute(
-            name=db_ship.name or db_ship.ship_id,
-            ship_id=db_ship.ship_id,
-            start=(start_lat, start_lng),
-            goal=(goal_lat, goal_lng),
-            path=path_latlng,
-            departure_time=db_ship.actual_departure,
-            speed_knots=db_ship.speed_knots
+def simulation_base_time() -> datetime:
+    """Today at 00:00:00, the base the departure/arrival planners measure minutes from"""
+    return datetime.combine(date.today(), datetime.min.time())
+
+
+def invalidate_simulation_caches():
+    """Force the next load_simulation_ships/load_simulation_routes call to re-read ship_routes_simulation"""
+    simulation_ships_cache["stamp"] = None
+    simulation_routes_cache["stamp"] = None
+
+
+def seconds_of_day(dt: datetime) -> int:
+    """Whole seconds since midnight, ignoring the date"""
+    return dt.hour * 3600 + dt.minute * 60 + dt.second
+
+
+def clock_hhmm(seconds: int) -> str:
+    """HH:MM for a seconds_of_day value, without going through strftime"""
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}"
+
+
+def load_simulation_routes(db: Session) -> List[dict]:
+    """
+    All ship_routes_simulation rows ordered by departure, each as
+    {"route": response fields with the decoded path, "cum_nm": cumulative NM at each waypoint,
+     "departure_seconds"/"arrival_seconds": time of day in whole seconds (arrival may be None)}.
+    Rebuilt only when the table changes.
+    """
+    # Content probe catches out-of-process writers; in-app writers also invalidate explicitly
+    stamp = tuple(db.execute(text(
+        f"SELECT {SIMULATION_STAMP_COLUMNS} FROM ship_routes_simulation"
+    )).one())
+    if simulation_routes_cache["stamp"] == stamp:
+        return simulation_routes_cache["routes"]
+
+    rows = db.execute(text("""
+        SELECT ship_id, ship_name, departure_time, arrival_time,
+               path, speed_knots, direction, total_distance_nm
+        FROM ship_routes_simulation
+        ORDER BY departure_time
+    """)).fetchall()
+
+    routes = []
+    for ship_id, ship_name, departure, arrival, path_json, speed, direction, distance in rows:
+        path = orjson.loads(path_json)
+        routes.append({
+            "route": {
+                "ship_id": ship_id,
+                "ship_name": ship_name,
+                "departure_time": departure,
+                "arrival_time": arrival,
+                "path": path,
+                "speed_knots": speed,
+                "direction": direction,
+                "total_distance_nm": distance
+            },
+            "cum_nm": np.concatenate(([0.0], np.cumsum(path_segment_distances(path)))),
+            "departure_seconds": seconds_of_day(datetime.fromisoformat(departure)),
+            "arrival_seconds": seconds_of_day(datetime.fromisoformat(arrival)) if arrival else None
+        })
+
+    simulation_routes_cache["stamp"] = stamp
+    simulation_routes_cache["routes"] = routes
+    simulation_routes_cache["fleet"] = stack_simulation_routes(routes)
+    # Later departures overwrite earlier ones, leaving each ship's latest route
+    simulation_routes_cache["by_ship"] = {entry["route"]["ship_id"]: entry["route"] for entry in routes}
+    simulation_routes_cache["schedules"] = None
+    return routes
+
+
+def stack_simulation_routes(routes: List[dict]) -> dict:
+    """
+    Routes with a path, as per-ship arrays plus all waypoints concatenated.
+    Each ship's cumulative distances are shifted past the previous ship's so
+    one searchsorted over "search_nm" finds the current segment of every ship.
+    """
+    routes = [entry for entry in routes if entry["route"]["path"]]
+    lengths = np.array([len(entry["cum_nm"]) for entry in routes], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    waypoints = (np.concatenate([np.asarray(entry["route"]["path"], dtype=np.float64).reshape(-1, 2)
+                                 for entry in routes]) if routes else np.zeros((0, 2)))
+    cum_nm = np.concatenate([entry["cum_nm"] for entry in routes]) if routes else np.zeros(0)
+    shifts = np.concatenate(([0.0], np.cumsum([entry["cum_nm"][-1] + 1.0 for entry in routes])))[:-1]
+    ship_ids = [entry["route"]["ship_id"] for entry in routes]
+    # Handle both EUM and SHIP prefixes
+    dev_ids = [int(ship_id[3:] if ship_id.startswith('EUM') else ship_id[4:]) for ship_id in ship_ids]
+    return {
+        "ship_ids": ship_ids,
+        "dev_ids": dev_ids,
+        "has_ship1": 1 in dev_ids,
+        "departure_seconds": np.array([entry["departure_seconds"] for entry in routes], dtype=np.float64),
+        "arrival_seconds": np.array([entry["arrival_seconds"] or 0 for entry in routes], dtype=np.float64),
+        "speeds": np.array([entry["route"]["speed_knots"] for entry in routes], dtype=np.float64),
+        "offsets": offsets,
+        # Where parked ships sit before departure and after arrival
+        "starts": waypoints[offsets[:-1]],
+        "ends": waypoints[offsets[1:] - 1],
+        "waypoints": waypoints,
+        "cum_nm": cum_nm,
+        "shifts": shifts,
+        "search_nm": cum_nm + np.repeat(shifts, lengths)
+    }
+
+
+def simulation_fleet_positions(fleet: dict, current_seconds: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (lats, lngs, is_moving) of every stacked route at a time of day.
+    Parked ships take their cached start/end waypoint; only ships under way are interpolated.
+    """
+    departure_seconds, arrival_seconds = fleet["departure_seconds"], fleet["arrival_seconds"]
+
+    # Not departed yet: start position; past the arrival time: end position
+    waiting = current_seconds < departure_seconds
+    arrived = ~waiting & (arrival_seconds > 0) & (current_seconds >= arrival_seconds)
+    positions = np.where(arrived[:, None], fleet["ends"], fleet["starts"])
+    is_moving = ~(waiting | arrived)
+
+    moving = np.flatnonzero(is_moving)
+    if moving.size:
+        offsets, waypoints, cum_nm = fleet["offsets"], fleet["waypoints"], fleet["cum_nm"]
+        first, last = offsets[moving], offsets[moving + 1] - 1
+
+        # Ships in transit have sailed speed * elapsed hours along their path
+        distance_nm = fleet["speeds"][moving] * (current_seconds - departure_seconds[moving]) / 3600.0
+
+        # Global index of the first waypoint at or beyond that distance (at least the second waypoint)
+        end = np.searchsorted(fleet["search_nm"], distance_nm + fleet["shifts"][moving])
+        end = np.clip(end, first + 1, last + 1)
+        past_end = end > last
+        end = np.minimum(end, last)
+        start = np.maximum(end - 1, first)
+
+        segment_nm = cum_nm[end] - cum_nm[start]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fraction = np.where(segment_nm > 0, (distance_nm - cum_nm[start]) / segment_nm, 0.0)
+        interpolated = waypoints[start] + (waypoints[end] - waypoints[start]) * fraction[:, None]
+
+        # Sailed past the last waypoint before the scheduled arrival: treat as arrived
+        positions[moving] = np.where(past_end[:, None], waypoints[last], interpolated)
+        is_moving[moving[past_end]] = False
+
+    return positions[:, 0], positions[:, 1], is_moving
+
+
+def load_simulation_ships(db: Session, exclude_ship_id: str = "SHIP001") -> List[ShipRoute]:
+    """Timestamped ShipRoutes from ship_routes_simulation, rebuilt only when the table changes"""
+    # Content probe catches out-of-process writers; in-app writers also invalidate explicitly
+    stamp = (exclude_ship_id,) + tuple(db.execute(text(f"""
+        SELECT {SIMULATION_STAMP_COLUMNS}
+        FROM ship_routes_simulation
+        WHERE ship_id != :exclude_ship_id
+    """), {"exclude_ship_id": exclude_ship_id}).one())
+    if simulation_ships_cache["stamp"] == stamp:
+        return simulation_ships_cache["ships"]
+
+    simulation_rows = db.execute(text("""
+        SELECT ship_id, ship_name, departure_time, path, speed_knots
+        FROM ship_routes_simulation
+        WHERE ship_id != :exclude_ship_id
+        ORDER BY departure_time
+    """), {"exclude_ship_id": exclude_ship_id}).fetchall()
+
+    ships = []
+    for ship_id_db, ship_name, departure_str, path_json, speed in simulation_rows:
+        path = orjson.loads(path_json)
+
+        # Create ShipRoute object for collision checking
+        existing_route = ShipRoute(
+            name=ship_name,
+            ship_id=ship_id_db,
+            start=tuple(path[0]) if path else (0, 0),
+            goal=tuple(path[-1]) if path else (0, 0),
+            path=path,
+            departure_time=datetime.fromisoformat(departure_str),
+            speed_knots=speed
         )
-        ship.calculate_timestamps()
-        ships.append(ship)
+        existing_route.calculate_timestamps()
+        ships.append(existing_route)
 
+    simulation_ships_cache["stamp"] = stamp
+    simulation_ships_cache["ships"] = ships
+    simulation_ships_cache["extents"] = FleetExtents.from_ships(ships)
     return ships
 
 
-def calculate_segments(path: List[tuple], speed_knots: float) -> List[RouteSegment]:
-    """Calculate route segments with speeds using lat/lng coordinates"""
-    from core_optimizer_latlng import haversine_distance
+def anchor_departure(route: ShipRoute, actual_departure: float, now: datetime) -> ShipRoute:
+    """Copy of a cached route departing actual_departure minutes after now"""
+    anchored = copy.copy(route)
+    anchored.shift_departure(now + timedelta(minutes=actual_departure))
+    return anchored
+
+
+@lru_cache(maxsize=512)
+def get_cached_existing_ship(ship_id: str, ship_name: Optional[str],
+                             start_x: float, start_y: float, goal_x: float, goal_y: float,
+                             path_points: Optional[str], actual_departure: float,
+                             speed_knots: float) -> ShipRoute:
+    """Build a planned ShipRoute once per row; callers re-anchor it with anchor_departure"""
+    # Get path - if it's in pixel format, convert to lat/lng
+    path_data = np.asarray(orjson.loads(path_points) if path_points else [],
+                           dtype=np.float64).reshape(-1, 2)
+    # Keep points already in lat/lng (typical range), convert the rest from pixels
+    is_latlng = ((path_data[:, 0] >= 35) & (path_data[:, 0] <= 37) &
+                 (path_data[:, 1] >= 129) & (path_data[:, 1] <= 131))
+    if is_latlng.all():
+        path_latlng = path_data.tolist()
+    else:
+        path_latlng = np.where(is_latlng[:, None], path_data,
+                               pixels_to_lat_lng(path_data)).tolist()
 
-    segments = []
-    speed_nm_per_minute = speed_knots / 60.0
+    # Start and goal are stored in pixel coordinates
+    start_lat = MAP_ORIGIN_LAT - start_y * PIXEL_SCALE
+    start_lng = MAP_ORIGIN_LNG + start_x * PIXEL_SCALE
+    goal_lat = MAP_ORIGIN_LAT - goal_y * PIXEL_SCALE
+    goal_lng = MAP_ORIGIN_LNG + goal_x * PIXEL_SCALE
+
+    ship = ShipRoute(
+        name=ship_name or ship_id,
+        ship_id=ship_id,
+        start=(start_lat, start_lng),
+        goal=(goal_lat, goal_lng),
+        path=path_latlng,
+        departure_time=actual_departure,
+        speed_knots=speed_knots
+    )
+    ship.calculate_timestamps()
+    return ship
+
+
+def get_existing_ships(db: Session, exclude_ship_id: str = None) -> List[ShipRoute]:
+    """Get all active ships from database"""
+    query = select(
+        DBShipRoute.ship_id, DBShipRoute.ship_name,
+        DBShipRoute.start_x, DBShipRoute.start_y,
+        DBShipRoute.goal_x, DBShipRoute.goal_y,
+        DBShipRoute.path_points, DBShipRoute.actual_departure,
+        DBShipRoute.speed_knots
+    ).where(DBShipRoute.status.in_(['accepted', 'active']))
+
+    if exclude_ship_id:
+        query = query.where(DBShipRoute.ship_id != exclude_ship_id)
 
-    for i in range(len(path) - 1):
-        start = path[i]
-        end = path[i + 1]
+    # Unchanged rows reuse their built ShipRoute; actual_departure is minutes from
+    # now, so every call re-anchors the timestamps at the same instant
+    now = datetime.now()
+    return [anchor_departure(get_cached_existing_ship(*row), row.actual_departure, now)
+            for row in db.execute(query)]
 
-        # Calculate distance using haversine formula
-        distance_nm = haversine_distance(start[0], start[1], end[0], end[1])
-        duration_minutes = distance_nm / speed_nm_per_minute if speed_nm_per_minute > 0 else 0
 
-        segment = RouteSegment(
+def calculate_segments(path: List[tuple], speed_knots: float) -> List[RouteSegment]:
+    """Calculate route segments with speeds using lat/lng coordinates"""
+    # Haversine distances for all segments at once
+    distances_nm = path_segment_distances(path)
+    speed_nm_per_minute = speed_knots / 60.0
+    if speed_nm_per_minute > 0:
+        durations = distances_nm / speed_nm_per_minute
+    else:
+        durations = np.zeros_like(distances_nm)
+
+    return [
+        RouteSegment(
             start_point=start,
             end_point=end,
             speed_knots=speed_knots,
             duration_minutes=duration_minutes,
             distance_nm=distance_nm
         )
-        segments.append(segment)
+        for start, end, duration_minutes, distance_nm
+        in zip(path[:-1], path[1:], durations.tolist(), distances_nm.tolist())
+    ]
 
-    return segments
+
+def upsert_ship_route(db: Session, payload: dict):
+    """Replace any previous plan for this ship in a single statement"""
+    stmt = sqlite_insert(DBShipRoute).values(**payload)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['ship_id'],
+        set_={**payload, "updated_at": datetime.utcnow()}
+    )
+    db.execute(stmt)
+    db.commit()
 
 
 @app.post("/api/route/plan", response_model=RouteResponse)
@@ -278,8 +605,8 @@ async def plan_route(request: RouteRequest, db: Session = Depends(get_db)):
         # Check if it's already lat/lng (typical Pohang area values)
         if not (35 <= start_pos[0] <= 37 and 129 <= start_pos[1] <= 131):
             # Convert from pixel to lat/lng
-            start_lat = MAP_ORIGIN['lat'] - (start_pos[1] * 0.00001)
-            start_lng = MAP_ORIGIN['lng'] + (start_pos[0] * 0.00001)
+            start_lat = MAP_ORIGIN_LAT - (start_pos[1] * PIXEL_SCALE)
+            start_lng = MAP_ORIGIN_LNG + (start_pos[0] * PIXEL_SCALE)
             start_pos = (start_lat, start_lng)
             print(f"Converted start from pixels to lat/lng: {start_pos}")
 
@@ -287,8 +614,8 @@ async def plan_route(request: RouteRequest, db: Session = Depends(get_db)):
         # Check if it's already lat/lng (typical Pohang area values)
         if not (35 <= goal_pos[0] <= 37 and 129 <= goal_pos[1] <= 131):
             # Convert from pixel to lat/lng
-            goal_lat = MAP_ORIGIN['lat'] - (goal_pos[1] * 0.00001)
-            goal_lng = MAP_ORIGIN['lng'] + (goal_pos[0] * 0.00001)
+            goal_lat = MAP_ORIGIN_LAT - (goal_pos[1] * PIXEL_SCALE)
+            goal_lng = MAP_ORIGIN_LNG + (goal_pos[0] * PIXEL_SCALE)
             goal_pos = (goal_lat, goal_lng)
             print(f"Converted goal from pixels to lat/lng: {goal_pos}")
 
@@ -298,11 +625,7 @@ async def plan_route(request: RouteRequest, db: Session = Depends(get_db)):
     print(f"Processing route from {start_pos} to {goal_pos}")
 
     # Find optimal path using lat/lng-based A* algorithm
-    optimal_path = route_optimizer.find_path_astar(
-        start_pos[0], start_pos[1],
-        goal_pos[0], goal_pos[1],
-        departure_time=datetime.fromtimestamp(request.departure_time * 60) if request.departure_time else None
-    )
+    optimal_path = find_path_cached(start_pos[0], start_pos[1], goal_pos[0], goal_pos[1])
 
     if not optimal_path:
         raise HTTPException(status_code=400, detail="No valid path found")
@@ -319,22 +642,17 @@ async def plan_route(request: RouteRequest, db: Session = Depends(get_db)):
     )
     new_ship.calculate_timestamps()
 
-    # Check for time conflicts with existing ships and optimize
-    if existing_ships:
+    # Check for time conflicts with ships whose routes come near this one
+    nearby_ships = ships_near_path(new_ship.path_arr, existing_ships)
+    if nearby_ships:
         # Try to find a better departure time if there are conflicts
         optimal_time = route_optimizer.optimize_departure_time(
-            new_ship, existing_ships,
+            new_ship, nearby_ships,
             time_window_minutes=120  # Allow +/- 2 hours flexibility
         )
         if optimal_time != request.departure_time:
-            # Recalculate path with new departure time
-            optimal_path = route_optimizer.find_path_astar(
-                start_pos[0], start_pos[1],
-                goal_pos[0], goal_pos[1],
-                departure_time=datetime.fromtimestamp(optimal_time * 60)
-            )
+            # The path does not depend on departure time; only re-time it
             new_ship.departure_time = optimal_time
-            new_ship.path = optimal_path
             new_ship.calculate_timestamps()
     else:
         optimal_time = request.departure_time
@@ -349,51 +667,38 @@ async def plan_route(request: RouteRequest, db: Session = Depends(get_db)):
     time_adjusted = abs(optimal_time - request.departure_time) > 0.1
     optimization_type = "time_adjusted" if time_adjusted else "none"
 
-    # Save to database (as pending)
-    db_ship = DBShipRoute(
-        ship_id=request.ship_id,
-        ship_name=request.ship_id,
-        start_lat=start_pos[0],
-        start_lng=start_pos[1],
-        goal_lat=goal_pos[0],
-        goal_lng=goal_pos[1],
-        requested_departure=request.departure_time,
-        actual_departure=optimal_time,
-        arrival_time=arrival_time,
-        speed_knots=request.speed_knots,
-        path_length_nm=path_length_nm,
-        status='pending',
-        optimization_mode='flexible'
-    )
-    db_ship.set_path(optimal_path)
-    db_ship.set_speeds([request.speed_knots] * len(segments))
-
-    # Check if ship already exists and properly delete it
-    existing = db.query(DBShipRoute).filter(DBShipRoute.ship_id == request.ship_id).first()
-    if existing:
-        db.delete(existing)
-        db.commit()  # Commit the deletion first
+    # Save to database (as pending); start/goal columns hold pixel coordinates
+    start_x, start_y = lat_lng_to_pixel(start_pos[0], start_pos[1])
+    goal_x, goal_y = lat_lng_to_pixel(goal_pos[0], goal_pos[1])
+    payload = {
+        "ship_id": request.ship_id,
+        "ship_name": request.ship_id,
+        "start_x": start_x,
+        "start_y": start_y,
+        "goal_x": goal_x,
+        "goal_y": goal_y,
+        "requested_departure": request.departure_time,
+        "actual_departure": optimal_time,
+        "arrival_time": arrival_time,
+        "speed_knots": request.speed_knots,
+        "path_points": orjson.dumps([[p[0], p[1]] for p in optimal_path]).decode(),
+        "path_speeds": orjson.dumps([request.speed_knots] * len(segments)).decode(),
+        "path_length_nm": path_length_nm,
+        "status": 'pending',
+        "optimization_mode": 'flexible'
+    }
 
-    db.add(db_ship)
-    db.commit()
+    upsert_ship_route(db, payload)
 
     # Path is already in lat/lng format
     path_points_latlng = [[point[0], point[1]] for point in optimal_path]
 
-    # Segments are already in lat/lng format
-    segments_latlng = []
-    for seg in segments:
-        seg_dict = seg.dict()
-        seg_dict['start_point'] = [seg.start_point[0], seg.start_point[1]]
-        seg_dict['end_point'] = [seg.end_point[0], seg.end_point[1]]
-        segments_latlng.append(RouteSegment(**seg_dict))
-
     return RouteResponse(
         ship_id=request.ship_id,
         recommended_departure=optimal_time,
         arrival_time=arrival_time,
         path_points=path_points_latlng,  # Return path in lat/lng format
-        segments=segments_latlng,
+        segments=segments,  # Already RouteSegment objects in lat/lng format
         total_distance_nm=path_length_nm,
         total_duration_minutes=total_duration,
         optimization_type=optimization_type,
@@ -472,85 +777,109 @@ async def accept_route(acceptance: RouteAcceptance, db: Session = Depends(get_db
         )
 
 
-@app.get("/api/ships", response_model=List[RouteStatus])
-async def get_all_ships(db: Session = Depends(get_db)):
-    """Get all ships and their current status"""
+@lru_cache(maxsize=512)
+def _build_ship_route(ship_id: str, ship_name: Optional[str], actual_departure: float,
+                      speed_knots: float, path_json: str) -> ShipRoute:
+    path = orjson.loads(path_json) if path_json else []
+    ship = ShipRoute(
+        name=ship_name or ship_id,
+        ship_id=ship_id,
+        start=tuple(path[0]) if path else None,
+        goal=tuple(path[-1]) if path else None,
+        path=path,
+        departure_time=actual_departure,
+        speed_knots=speed_knots
+    )
+    ship.calculate_timestamps()
+    return ship
+
+
+def get_cached_ship_route(ship_id: str, ship_name: Optional[str], actual_departure: float,
+                          speed_knots: float, path_json: str,
+                          now: Optional[datetime] = None) -> ShipRoute:
+    """
+    ShipRoute for a route row, with timestamps anchored at now (default: the current time).
+    The path and time offsets are built once per row; actual_departure is minutes from
+    now, so only the departure anchor is recomputed on each call.
+    """
+    ship = _build_ship_route(ship_id, ship_name, actual_departure, speed_knots, path_json)
+    return anchor_departure(ship, actual_departure, now or datetime.now())
+
+
+@lru_cache(maxsize=256)
+def _find_path(start_lat: float, start_lng: float,
+               goal_lat: float, goal_lng: float) -> Optional[tuple]:
+    path = route_optimizer.find_path_astar(start_lat, start_lng, goal_lat, goal_lng)
+    return tuple(path) if path else None
+
+
+def find_path_cached(start_lat: float, start_lng: float,
+                     goal_lat: float, goal_lng: float) -> Optional[List[Tuple[float, float]]]:
+    """
+    A* path between two points, computed once per (start, goal) pair.
+    Keyed on the exact coordinates (dock and fishing points are per-ship constants),
+    so the path still starts at the real position; it does not depend on
+    departure time because the search only avoids static obstacles.
+    """
+    path = _find_path(start_lat, start_lng, goal_lat, goal_lng)
+    return list(path) if path else None
+
+
+ROUTE_STATUS_COLUMNS = (
+    DBShipRoute.ship_id, DBShipRoute.ship_name, DBShipRoute.status,
+    DBShipRoute.actual_departure, DBShipRoute.arrival_time,
+    DBShipRoute.speed_knots, DBShipRoute.path_points,
+    DBShipRoute.optimization_mode
+)
 
-    db_ships = db.query(DBShipRoute).all()
-    results = []
-
-    for db_ship in db_ships:
-        # Calculate current position if active
-        current_position = None
-        if db_ship.status in ['active', 'accepted']:
-            ship = ShipRoute(
-                name=db_ship.name,
-                ship_id=db_ship.ship_id,
-                start=(db_ship.start_x, db_ship.start_y),
-                goal=(db_ship.goal_x, db_ship.goal_y),
-                path=db_ship.get_path(),
-                departure_time=db_ship.actual_departure,
-                speed_knots=db_ship.speed_knots
-            )
-            ship.calculate_timestamps()
 
-            # Get current time (simplified - would use real time in production)
-            import time
-            current_time = time.time() / 60  # Convert to minutes
-            current_position = ship.get_position_at_time(current_time)
+@lru_cache(maxsize=512)
+def decode_path_points(path_json: Optional[str]) -> list:
+    """Stored path JSON as a list of points, decoded once per distinct value (callers must not mutate it)"""
+    return orjson.loads(path_json) if path_json else []
+
+
+def build_route_status(row, current_time: datetime) -> dict:
+    """RouteStatus fields for a route row selected with ROUTE_STATUS_COLUMNS"""
+    # Calculate current position if active
+    current_position = None
+    if row.status in ['active', 'accepted']:
+        ship = get_cached_ship_route(row.ship_id, row.ship_name, row.actual_departure,
+                                     row.speed_knots, row.path_points, current_time)
+        current_position = ship.get_position_at_time(current_time)
+
+    return {
+        "ship_id": row.ship_id,
+        "status": row.status,
+        "current_position": current_position,
+        "departure_time": row.actual_departure,
+        "arrival_time": row.arrival_time,
+        "path_points": decode_path_points(row.path_points),
+        "optimization_mode": row.optimization_mode or 'flexible'
+    }
 
-        status = RouteStatus(
-            ship_id=db_ship.ship_id,
-            status=db_ship.status,
-            current_position=current_position,
-            departure_time=db_ship.actual_departure,
-            arrival_time=db_ship.arrival_time,
-            path_points=db_ship.get_path(),
-            optimization_mode=db_ship.optimization_mode or 'flexible'
-        )
-        results.append(status)
 
-    return results
+@app.get("/api/ships", response_model=List[RouteStatus])
+async def get_all_ships(db: AsyncSession = Depends(get_async_db)):
+    """Get all ships and their current status"""
+    current_time = datetime.now()
+    rows = (await db.execute(select(*ROUTE_STATUS_COLUMNS))).all()
+
+    return ORJSONResponse(content=[build_route_status(row, current_time) for row in rows])
 
 
 @app.get("/api/ship/{ship_id}", response_model=RouteStatus)
-async def get_ship_status(ship_id: str, db: Session = Depends(get_db)):
+async def get_ship_status(ship_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get specific ship status"""
 
-    db_ship = db.query(DBShipRoute).filter(
-        DBShipRoute.ship_id == ship_id
-    ).first()
+    row = (await db.execute(
+        select(*ROUTE_STATUS_COLUMNS).where(DBShipRoute.ship_id == ship_id)
+    )).first()
 
-    if not db_ship:
+    if not row:
         raise HTTPException(status_code=404, detail="Ship not found")
 
-    # Calculate current position if active
-    current_position = None
-    if db_ship.status in ['active', 'accepted']:
-        ship = ShipRoute(
-            name=db_ship.name,
-            ship_id=db_ship.ship_id,
-            start=(db_ship.start_x, db_ship.start_y),
-            goal=(db_ship.goal_x, db_ship.goal_y),
-            path=db_ship.get_path(),
-            departure_time=db_ship.actual_departure,
-            speed_knots=db_ship.speed_knots
-        )
-        ship.calculate_timestamps()
-
-        import time
-        current_time = time.time() / 60
-        current_position = ship.get_position_at_time(current_time)
-
-    return RouteStatus(
-        ship_id=db_ship.ship_id,
-        status=db_ship.status,
-        current_position=current_position,
-        departure_time=db_ship.actual_departure,
-        arrival_time=db_ship.arrival_time,
-        path_points=db_ship.get_path(),
-        optimization_mode=db_ship.optimization_mode or 'flexible'
-    )
+    return ORJSONResponse(content=build_route_status(row, datetime.now()))
 
 
 @app.delete("/api/ship/{ship_id}")
@@ -573,37 +902,38 @@ async def delete_ship(ship_id: str, db: Session = Depends(get_db)):
 # EUM API Integration Endpoints
 
 @app.get("/api/eum/ships", response_model=List[ShipInfo])
-async def get_eum_ships(db: Session = Depends(get_db)):
+async def get_eum_ships(db: AsyncSession = Depends(get_async_db)):
     """Get all ships from database (synced from EUM API)"""
-    ships = db.query(DBShip).all()
-    return [
-        ShipInfo(
-            id=ship.id,
-            shipId=ship.ship_id,
-            type=ship.type or "",
-            name=ship.name or "",
-            pol=ship.pol or "",
-            polAddr=ship.pol_addr or "",
-            hm="",
-            pe="",
-            ps=0.0,
-            kw=0.0,
-            engineCnt=0,
-            propeller="",
-            propellerCnt=0,
-            length=ship.length or 0.0,
-            breath=ship.breath or 0.0,
-            depth=ship.depth or 0.0,
-            gt=ship.gt or 0.0,
-            sign="",
-            rgDtm="",
-            dcDate="",
-            fishingAreaLat=ship.fishing_area_lat,
-            fishingAreaLng=ship.fishing_area_lng,
-            dockingLat=ship.docking_lat,
-            dockingLng=ship.docking_lng
-        ) for ship in ships
-    ]
+    ships = (await db.execute(select(DBShip))).scalars().all()
+    return ORJSONResponse(content=[
+        {
+            "id": ship.id,
+            "shipId": ship.ship_id,
+            "type": ship.type or "",
+            "name": ship.name or "",
+            "pol": ship.pol or "",
+            "polAddr": ship.pol_addr or "",
+            "hm": "",
+            "pe": "",
+            "ps": 0.0,
+            "kw": 0.0,
+            "engineCnt": 0,
+            "propeller": "",
+            "propellerCnt": 0,
+            "length": ship.length or 0.0,
+            "breath": ship.breath or 0.0,
+            "depth": ship.depth or 0.0,
+            "gt": ship.gt or 0.0,
+            "sign": "",
+            "rgDtm": "",
+            "dcDate": "",
+            "fishingAreaLat": ship.fishing_area_lat,
+            "fishingAreaLng": ship.fishing_area_lng,
+            "dockingLat": ship.docking_lat,
+            "dockingLng": ship.docking_lng
+        }
+        for ship in ships
+    ])
 
 
 @app.post("/api/eum/ships/sync")
@@ -638,92 +968,99 @@ async def update_ship_positions(
     return {"message": f"Positions updated for ship {ship_id}"}
 
 
-@app.get("/api/eum/cctv", response_model=List[CCTVDevice])
-async def get_cctv_devices(db: Session = Depends(get_db)):
-    """Get CCTV devices (hardcoded from actual EUM API data)"""
-    # Hardcoded CCTV data from cctv.md with correct coordinates
-    cctv_data = [
-        {"id": 1, "name": "구룡포 북방파제 AI-01-001", "latitude": "35.985667", "longitude": "129.557917", "address": "포항시 남구 구룡포읍 구룡포리 954-3", "url": "https://hls-cctv.pohang-eum.co.kr/cam1/index.m3u8", "poleId": 6},
-        {"id": 2, "name": "구룡포 북방파제 ROTT-01-001", "latitude": "35.985667", "longitude": "129.557917", "address": "포항시 남구 구룡포읍 구룡포리 954-3", "url": "https://hls-cctv.pohang-eum.co.kr/cam2/index.m3u8", "poleId": 6},
-        {"id": 3, "name": "구룡포 북방파제 AI-02-002", "latitude": "35.989056", "longitude": "129.560639", "address": "포항시 남구 구룡포읍 구룡포리 954-3", "url": "https://hls-cctv.pohang-eum.co.kr/cam3/index.m3u8", "poleId": 9},
-        {"id": 4, "name": "구룡포 북방파제 AI-02-001", "latitude": "35.989056", "longitude": "129.560639", "address": "포항시 남구 구룡포읍 구룡포리 954-3", "url": "https://hls-cctv.pohang-eum.co.kr/cam4/index.m3u8", "poleId": 9},
-        {"id": 5, "name": "구룡포 북방파제 ROTT-02-001", "latitude": "35.989056", "longitude": "129.560639", "address": "포항시 남구 구룡포읍 구룡포리 954-3", "url": "https://hls-cctv.pohang-eum.co.kr/cam5/index.m3u8", "poleId": 9},
-        {"id": 6, "name": "구룡포 북방파제 AI-03-001", "latitude": "35.988194", "longitude": "129.559556", "address": "포항시 남구 구룡포읍 구룡포리 954-3", "url": "https://hls-cctv.pohang-eum.co.kr/cam6/index.m3u8", "poleId": 8},
-        {"id": 7, "name": "구룡포 북방파제 AI-03-002", "latitude": "35.988194", "longitude": "129.559556", "address": "포항시 남구 구룡포읍 구룡포리 954-3", "url": "https://hls-cctv.pohang-eum.co.kr/cam7/index.m3u8", "poleId": 8},
-        {"id": 8, "name": "구룡포 북방파제 ROTT-03-001", "latitude": "35.988194", "longitude": "129.559556", "address": "포항시 남구 구룡포읍 구룡포리 954-3", "url": "https://hls-cctv.pohang-eum.co.kr/cam8/index.m3u8", "poleId": 8},
-        {"id": 9, "name": "구룡포 북방파제 AI-04-002", "latitude": "35.987417", "longitude": "129.558556", "address": "포항시 남구 구룡포읍 구룡포리 954-3", "url": "https://hls-cctv.pohang-eum.co.kr/cam9/index.m3u8", "poleId": 7},
-        {"id": 10, "name": "구룡포 북방파제 AI-04-001", "latitude": "35.987417", "longitude": "129.558556", "address": "포항시 남구 구룡포읍 구룡포리 954-3", "url": "https://hls-cctv.pohang-eum.co.kr/cam10/index.m3u8", "poleId": 7},
-        {"id": 11, "name": "구룡포 북방파제 ROTT-04-001", "latitude": "35.987417", "longitude": "129.558556", "address": "포항시 남구 구룡포읍 구룡포리 954-3", "url": "https://hls-cctv.pohang-eum.co.kr/cam11/index.m3u8", "poleId": 7},
-        {"id": 12, "name": "구룡포수협맞은편 ROTT-01-001", "latitude": "35.991111", "longitude": "129.557444", "address": "포항시 남구 구룡포읍 구룡포리 954-30", "url": "https://hls-cctv.pohang-eum.co.kr/cam12/index.m3u8", "poleId": 10},
-        {"id": 13, "name": "구룡포항구어시장맞은편 ROTT-01-001", "latitude": "35.990694", "longitude": "129.555917", "address": "포항시 남구 구룡포읍 구룡포리 954-34", "url": "https://hls-cctv.pohang-eum.co.kr/cam13/index.m3u8", "poleId": 11},
-        {"id": 14, "name": "구룡포 공영주차장(신축) ROTT-01-001", "latitude": "35.987417", "longitude": "129.552333", "address": "포항시 남구 구룡포읍 구룡포리 954-11", "url": "https://hls-cctv.pohang-eum.co.kr/cam14/index.m3u8", "poleId": 12},
-        {"id": 15, "name": "구룡포수협냉동공장맞은편 ROTT-01-001", "latitude": "35.985500", "longitude": "129.551833", "address": "포항시 남구 구룡포읍 구룡포리 954-12", "url": "https://hls-cctv.pohang-eum.co.kr/cam15/index.m3u8", "poleId": 13},
-        {"id": 16, "name": "구룡포 남방파제 AI-01-001", "latitude": "35.982750", "longitude": "129.557889", "address": "포항시 남구 구룡포읍 병포리 1-5", "url": "https://hls-cctv.pohang-eum.co.kr/cam16/index.m3u8", "poleId": 14},
-        {"id": 17, "name": "구룡포 남방파제 AI-01-002", "latitude": "35.982750", "longitude": "129.557889", "address": "포항시 남구 구룡포읍 병포리 1-5", "url": "https://hls-cctv.pohang-eum.co.kr/cam17/index.m3u8", "poleId": 14},
-        {"id": 18, "name": "구룡포 남방파제 ROTT-01-001", "latitude": "35.982750", "longitude": "129.557889", "address": "포항시 남구 구룡포읍 병포리 1-5", "url": "https://hls-cctv.pohang-eum.co.kr/cam18/index.m3u8", "poleId": 14},
-        {"id": 19, "name": "구룡포 남방파제 AI-02-001", "latitude": "35.984056", "longitude": "129.558250", "address": "포항시 남구 구룡포읍 병포리 1-5", "url": "https://hls-cctv.pohang-eum.co.kr/cam19/index.m3u8", "poleId": 15},
-        {"id": 20, "name": "구룡포 남방파제 ROTT-02-001", "latitude": "35.984056", "longitude": "129.558250", "address": "포항시 남구 구룡포읍 병포리 1-5", "url": "https://hls-cctv.pohang-eum.co.kr/cam20/index.m3u8", "poleId": 15},
-        {"id": 21, "name": "구룡포 남방파제 AI-03-001", "latitude": "35.984917", "longitude": "129.559167", "address": "포항시 남구 구룡포읍 병포리 1-5", "url": "https://hls-cctv.pohang-eum.co.kr/cam21/index.m3u8", "poleId": 16},
-        {"id": 22, "name": "구룡포 남방파제 AI-04-001", "latitude": "35.985583", "longitude": "129.560139", "address": "포항시 남구 구룡포읍 병포리 1-5", "url": "https://hls-cctv.pohang-eum.co.kr/cam22/index.m3u8", "poleId": 17},
-        {"id": 23, "name": "구룡포 남방파제 ROTT-04-001", "latitude": "35.985583", "longitude": "129.560139", "address": "포항시 남구 구룡포읍 병포리 1-5", "url": "https://hls-cctv.pohang-eum.co.kr/cam23/index.m3u8", "poleId": 17}
-    ]
+# Hardcoded CCTV data from cctv.md with correct coordinates
+CCTV_DATA = [
+    {"id": 1, "name": "구룡포 북방파제 AI-01-001", "latitude": "35.985667", "longitude": "129.557917", "address": "포항시 남구 구룡포읍 구룡포리 954-3", "url": "https://hls-cctv.pohang-eum.co.kr/cam1/index.m3u8", "poleId": 6},
+    {"id": 2, "name": "구룡포 북방파제 ROTT-01-001", "latitude": "35.985667", "longitude": "129.557917", "address": "포항시 남구 구룡포읍 구룡포리 954-3", "url": "https://hls-cctv.pohang-eum.co.kr/cam2/index.m3u8", "poleId": 6},
+    {"id": 3, "name": "구룡포 북방파제 AI-02-002", "latitude": "35.989056", "longitude": "129.560639", "address": "포항시 남구 구룡포읍 구룡포리 954-3", "url": "https://hls-cctv.pohang-eum.co.kr/cam3/index.m3u8", "poleId": 9},
+    {"id": 4, "name": "구룡포 북방파제 AI-02-001", "latitude": "35.989056", "longitude": "129.560639", "address": "포항시 남구 구룡포읍 구룡포리 954-3", "url": "https://hls-cctv.pohang-eum.co.kr/cam4/index.m3u8", "poleId": 9},
+    {"id": 5, "name": "구룡포 북방파제 ROTT-02-001", "latitude": "35.989056", "longitude": "129.560639", "address": "포항시 남구 구룡포읍 구룡포리 954-3", "url": "https://hls-cctv.pohang-eum.co.kr/cam5/index.m3u8", "poleId": 9},
+    {"id": 6, "name": "구룡포 북방파제 AI-03-001", "latitude": "35.988194", "longitude": "129.559556", "address": "포항시 남구 구룡포읍 구룡포리 954-3", "url": "https://hls-cctv.pohang-eum.co.kr/cam6/index.m3u8", "poleId": 8},
+    {"id": 7, "name": "구룡포 북방파제 AI-03-002", "latitude": "35.988194", "longitude": "129.559556", "address": "포항시 남구 구룡포읍 구룡포리 954-3", "url": "https://hls-cctv.pohang-eum.co.kr/cam7/index.m3u8", "poleId": 8},
+    {"id": 8, "name": "구룡포 북방파제 ROTT-03-001", "latitude": "35.988194", "longitude": "129.559556", "address": "포항시 남구 구룡포읍 구룡포리 954-3", "url": "https://hls-cctv.pohang-eum.co.kr/cam8/index.m3u8", "poleId": 8},
+    {"id": 9, "name": "구룡포 북방파제 AI-04-002", "latitude": "35.987417", "longitude": "129.558556", "address": "포항시 남구 구룡포읍 구룡포리 954-3", "url": "https://hls-cctv.pohang-eum.co.kr/cam9/index.m3u8", "poleId": 7},
+    {"id": 10, "name": "구룡포 북방파제 AI-04-001", "latitude": "35.987417", "longitude": "129.558556", "address": "포항시 남구 구룡포읍 구룡포리 954-3", "url": "https://hls-cctv.pohang-eum.co.kr/cam10/index.m3u8", "poleId": 7},
+    {"id": 11, "name": "구룡포 북방파제 ROTT-04-001", "latitude": "35.987417", "longitude": "129.558556", "address": "포항시 남구 구룡포읍 구룡포리 954-3", "url": "https://hls-cctv.pohang-eum.co.kr/cam11/index.m3u8", "poleId": 7},
+    {"id": 12, "name": "구룡포수협맞은편 ROTT-01-001", "latitude": "35.991111", "longitude": "129.557444", "address": "포항시 남구 구룡포읍 구룡포리 954-30", "url": "https://hls-cctv.pohang-eum.co.kr/cam12/index.m3u8", "poleId": 10},
+    {"id": 13, "name": "구룡포항구어시장맞은편 ROTT-01-001", "latitude": "35.990694", "longitude": "129.555917", "address": "포항시 남구 구룡포읍 구룡포리 954-34", "url": "https://hls-cctv.pohang-eum.co.kr/cam13/index.m3u8", "poleId": 11},
+    {"id": 14, "name": "구룡포 공영주차장(신축) ROTT-01-001", "latitude": "35.987417", "longitude": "129.552333", "address": "포항시 남구 구룡포읍 구룡포리 954-11", "url": "https://hls-cctv.pohang-eum.co.kr/cam14/index.m3u8", "poleId": 12},
+    {"id": 15, "name": "구룡포수협냉동공장맞은편 ROTT-01-001", "latitude": "35.985500", "longitude": "129.551833", "address": "포항시 남구 구룡포읍 구룡포리 954-12", "url": "https://hls-cctv.pohang-eum.co.kr/cam15/index.m3u8", "poleId": 13},
+    {"id": 16, "name": "구룡포 남방파제 AI-01-001", "latitude": "35.982750", "longitude": "129.557889", "address": "포항시 남구 구룡포읍 병포리 1-5", "url": "https://hls-cctv.pohang-eum.co.kr/cam16/index.m3u8", "poleId": 14},
+    {"id": 17, "name": "구룡포 남방파제 AI-01-002", "latitude": "35.982750", "longitude": "129.557889", "address": "포항시 남구 구룡포읍 병포리 1-5", "url": "https://hls-cctv.pohang-eum.co.kr/cam17/index.m3u8", "poleId": 14},
+    {"id": 18, "name": "구룡포 남방파제 ROTT-01-001", "latitude": "35.982750", "longitude": "129.557889", "address": "포항시 남구 구룡포읍 병포리 1-5", "url": "https://hls-cctv.pohang-eum.co.kr/cam18/index.m3u8", "poleId": 14},
+    {"id": 19, "name": "구룡포 남방파제 AI-02-001", "latitude": "35.984056", "longitude": "129.558250", "address": "포항시 남구 구룡포읍 병포리 1-5", "url": "https://hls-cctv.pohang-eum.co.kr/cam19/index.m3u8", "poleId": 15},
+    {"id": 20, "name": "구룡포 남방파제 ROTT-02-001", "latitude": "35.984056", "longitude": "129.558250", "address": "포항시 남구 구룡포읍 병포리 1-5", "url": "https://hls-cctv.pohang-eum.co.kr/cam20/index.m3u8", "poleId": 15},
+    {"id": 21, "name": "구룡포 남방파제 AI-03-001", "latitude": "35.984917", "longitude": "129.559167", "address": "포항시 남구 구룡포읍 병포리 1-5", "url": "https://hls-cctv.pohang-eum.co.kr/cam21/index.m3u8", "poleId": 16},
+    {"id": 22, "name": "구룡포 남방파제 AI-04-001", "latitude": "35.985583", "longitude": "129.560139", "address": "포항시 남구 구룡포읍 병포리 1-5", "url": "https://hls-cctv.pohang-eum.co.kr/cam22/index.m3u8", "poleId": 17},
+    {"id": 23, "name": "구룡포 남방파제 ROTT-04-001", "latitude": "35.985583", "longitude": "129.560139", "address": "포항시 남구 구룡포읍 병포리 1-5", "url": "https://hls-cctv.pohang-eum.co.kr/cam23/index.m3u8", "poleId": 17}
+]
+
+# Hardcoded LiDAR data from EUM API
+LIDAR_DATA = [
+    {
+        "id": 1,
+        "name": "구룡포 북방파제",
+        "latitude": "35.985667",
+        "longitude": "129.557917",
+        "address": "포항시 남구 구룡포읍 구룡포리 954-3"
+    },
+    {
+        "id": 2,
+        "name": "구룡포 남방파제",
+        "latitude": "35.984917",
+        "longitude": "129.559167",
+        "address": "포항시 남구 구룡포읍 병포리 1-5"
+    }
+]
 
-    return [
-        CCTVDevice(
-            id=device['id'],
-            name=device['name'],
-            latitude=device['latitude'],
-            longitude=device['longitude'],
-            address=device['address'],
-            url=device.get('url'),
-            poleId=device.get('poleId')
-        ) for device in cctv_data
-    ]
+# Device lists are static, so serialize them once at import
+_CCTV_JSON_BYTES = orjson.dumps([CCTVDevice(**device).dict() for device in CCTV_DATA])
+_LIDAR_JSON_BYTES = orjson.dumps([LiDARDevice(**device).dict() for device in LIDAR_DATA])
 
 
-@app.get("/api/eum/lidar", response_model=List[LiDARDevice])
-async def get_lidar_devices(db: Session = Depends(get_db)):
+@app.get("/api/eum/cctv")
+async def get_cctv_devices():
+    """Get CCTV devices (hardcoded from actual EUM API data)"""
+    return Response(content=_CCTV_JSON_BYTES, media_type="application/json")
+
+
+@app.get("/api/eum/lidar")
+async def get_lidar_devices():
     """Get LiDAR devices (hardcoded data)"""
+    return Response(content=_LIDAR_JSON_BYTES, media_type="application/json")
 
-    # Hardcoded LiDAR data from EUM API
-    lidar_data = [
-        {
-            "id": 1,
-            "name": "구룡포 북방파제",
-            "latitude": "35.985667",
-            "longitude": "129.557917",
-            "address": "포항시 남구 구룡포읍 구룡포리 954-3"
-        },
-        {
-            "id": 2,
-            "name": "구룡포 남방파제",
-            "latitude": "35.984917",
-            "longitude": "129.559167",
-            "address": "포항시 남구 구룡포읍 병포리 1-5"
-        }
-    ]
 
-    return [
-        LiDARDevice(
-            id=device['id'],
-            name=device['name'],
-            latitude=device['latitude'],
-            longitude=device['longitude'],
-            address=device['address']
-        ) for device in lidar_data
-    ]
+def store_cached_response(cache: dict, payload) -> None:
+    """Serialize a successful upstream payload into a TTL cache slot with its ETag"""
+    body = orjson.dumps(payload)
+    cache["body"] = body
+    cache["etag"] = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+    cache["fetched_at"] = time.monotonic()
+
+
+def cached_response(request: Request, cache: dict, ttl_seconds: float) -> Optional[Response]:
+    """Return the cached body (or 304 on a matching If-None-Match) while it is fresh"""
+    if cache["body"] is None or time.monotonic() - cache["fetched_at"] >= ttl_seconds:
+        return None
+
+    headers = {"ETag": cache["etag"], "Cache-Control": f"max-age={int(ttl_seconds)}"}
+    if request.headers.get("if-none-match") == cache["etag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=cache["body"], media_type="application/json", headers=headers)
 
 
 @app.get("/api/eum/lidar/statistics")
-async def get_lidar_statistics():
+async def get_lidar_statistics(request: Request):
     """Get real LiDAR entry/exit statistics from EUM API"""
-    import requests
-    import logging
-    logger = logging.getLogger(__name__)
+
+    # Serve the last successful response while it is fresh to absorb polling spikes
+    cached = cached_response(request, lidar_stats_cache, LIDAR_STATS_TTL_SECONDS)
+    if cached is not None:
+        return cached
 
     try:
         # Fetch real-time statistics from EUM API
-        response = requests.get('https://apis.pohang-eum.co.kr/lidar/realtime/recent/statics', verify=False)
+        response = await eum_http.get('https://apis.pohang-eum.co.kr/lidar/realtime/recent/statics')
 
         if response.status_code == 200:
             api_data = response.json()
@@ -756,42 +1093,49 @@ async def get_lidar_statistics():
                         "exit": recent['outCnt']
                     }
 
-                return JSONResponse(content=formatted_data)
+                store_cached_response(lidar_stats_cache, formatted_data)
+                return cached_response(request, lidar_stats_cache, LIDAR_STATS_TTL_SECONDS)
             else:
                 logger.error(f"Invalid API response format: {api_data}")
-                return JSONResponse(content={"error": "Invalid API response format"}, status_code=500)
+                return ORJSONResponse(content={"error": "Invalid API response format"}, status_code=500)
 
         else:
             logger.error(f"LiDAR statistics API call failed: {response.status_code}")
-            return JSONResponse(content={"error": f"API call failed with status {response.status_code}"}, status_code=500)
+            return ORJSONResponse(content={"error": f"API call failed with status {response.status_code}"}, status_code=500)
 
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"LiDAR statistics API error: {e}")
-        return JSONResponse(content={"error": f"Failed to fetch LiDAR statistics: {str(e)}"}, status_code=500)
+        return ORJSONResponse(content={"error": f"Failed to fetch LiDAR statistics: {str(e)}"}, status_code=500)
     except Exception as e:
         logger.error(f"Unexpected error in LiDAR statistics: {e}")
-        return JSONResponse(content={"error": f"Unexpected error: {str(e)}"}, status_code=500)
+        return ORJSONResponse(content={"error": f"Unexpected error: {str(e)}"}, status_code=500)
 
 
 @app.get("/api/eum/weather")
-async def get_weather(date: Optional[str] = None, db: Session = Depends(get_db)):
+async def get_weather(request: Request, date: Optional[str] = None, db: Session = Depends(get_db)):
     """Get weather data from OpenWeatherMap API"""
-    global weather_service
+
+    cached = cached_response(request, weather_cache, WEATHER_TTL_SECONDS)
+    if cached is not None:
+        return cached
 
     # Get current weather from OpenWeatherMap
     weather_data = await weather_service.get_current_weather()
 
     if "error" not in weather_data:
         # Successfully got weather data
-        return WeatherData(
+        store_cached_response(weather_cache, WeatherData(
             temperature=weather_data.get('temperature', 0.0),
             windSpeed=weather_data.get('wind_speed', 0.0),
             windDirection=weather_data.get('wind_direction', 0.0),
             humidity=weather_data.get('humidity', 0.0)
-        )
+        ).dict())
+        return cached_response(request, weather_cache, WEATHER_TTL_SECONDS)
     else:
-        # Try to get cached data from database if API fails
-        cached = db.query(DBWeatherData).order_by(DBWeatherData.id.desc()).first()
+        # Try to get cached data from database if API fails (off the event loop)
+        cached = await asyncio.to_thread(
+            lambda: db.query(DBWeatherData).order_by(DBWeatherData.id.desc()).first()
+        )
         if cached:
             return WeatherData(
                 temperature=cached.temperature,
@@ -812,28 +1156,32 @@ async def get_weather(date: Optional[str] = None, db: Session = Depends(get_db))
 @app.get("/api/eum/ships/realtime", response_model=List[ShipRealtimeLocation])
 async def get_realtime_locations(db: Session = Depends(get_db)):
     """Get real-time ship locations from database (Demo mode)"""
-    global eum_client
 
     # Fetch real-time data from API
     locations = eum_client.get_ship_realtime_location()
 
-    # Store in database for historical tracking
-    for loc_data in locations:
-        # Find ship_id from dev_id
-        ship = db.query(DBShip).filter(DBShip.id == loc_data['devId']).first()
-        if ship:
-            db_location = DBShipRealtimeLocation(
-                dev_id=loc_data['devId'],
-                ship_id=ship.ship_id,
-                log_datetime=loc_data['logDateTime'],
-                latitude=loc_data['lati'],
-                longitude=loc_data['longi'],
-                azimuth=loc_data['azimuth'],
-                course=loc_data['course'],
-                speed=loc_data['speed']
-            )
-            db.add(db_location)
+    # Resolve all dev_ids to ship_ids in one query
+    dev_ids = {loc['devId'] for loc in locations}
+    ship_ids_by_dev = dict(
+        db.query(DBShip.id, DBShip.ship_id).filter(DBShip.id.in_(dev_ids)).all()
+    )
 
+    # Store in database for historical tracking
+    rows = [
+        {
+            "dev_id": loc_data['devId'],
+            "ship_id": ship_ids_by_dev[loc_data['devId']],
+            "log_datetime": loc_data['logDateTime'],
+            "latitude": loc_data['lati'],
+            "longitude": loc_data['longi'],
+            "azimuth": loc_data['azimuth'],
+            "course": loc_data['course'],
+            "speed": loc_data['speed']
+        }
+        for loc_data in locations if loc_data['devId'] in ship_ids_by_dev
+    ]
+    if rows:
+        db.bulk_insert_mappings(DBShipRealtimeLocation, rows)
     db.commit()
 
     return [
@@ -851,207 +1199,202 @@ async def get_realtime_locations(db: Session = Depends(get_db)):
 
 
 # Live API endpoints - Directly fetch from EUM API without caching
+# ShipInfo defaults for fields the EUM payload may omit
+SHIPINFO_DEFAULTS = {
+    "type": "cargo",
+    "polAddr": "Pohang",
+    "pol": "PH",
+    "hm": "",
+    "pe": "",
+    "ps": 0.0,
+    "kw": 0.0,
+    "engineCnt": 1,
+    "propeller": "",
+    "propellerCnt": 1,
+    "length": 100,
+    "breath": 20,
+    "depth": 10,
+    "gt": 5000,
+    "sign": "",
+    "rgDtm": "",
+    "dcDate": ""
+}
+SHIPINFO_FLOAT_FIELDS = ("length", "breath", "depth", "gt")
+
+
 def convert_eum_ship_to_shipinfo(ship_data: dict, index: int) -> ShipInfo:
-    """Convert EUM ship data to ShipInfo format"""
-    return ShipInfo(
-        id=index,
-        shipId=str(ship_data.get('devId', f'ship_{index}')),
-        type=ship_data.get('type', 'cargo'),
-        name=ship_data.get('name', f'Ship {index}'),
-        polAddr=ship_data.get('polAddr', 'Pohang'),
-        pol=ship_data.get('pol', 'PH'),
-        pod=ship_data.get('pod', 'Unknown'),
-        hm=ship_data.get('hm', ''),
-        pe=ship_data.get('pe', ''),
-        ps=ship_data.get('ps', ''),
-        kw=ship_data.get('kw', 0),
-        engineCnt=ship_data.get('engineCnt', 1),
-        propeller=ship_data.get('propeller', ''),
-        propellerCnt=ship_data.get('propellerCnt', 1),
-        length=float(ship_data.get('length', 100)),
-        breath=float(ship_data.get('breath', 20)),
-        depth=float(ship_data.get('depth', 10)),
-        gt=float(ship_data.get('gt', 5000)),
-        sign=ship_data.get('sign', ''),
-        rgDtm=ship_data.get('rgDtm', ''),
-        dcDate=ship_data.get('dcDate', ''),
-        lat=float(ship_data.get('lat', 36.0)) if ship_data.get('lat') else 36.0,
-        lng=float(ship_data.get('lng', 129.4)) if ship_data.get('lng') else 129.4,
-        status=ship_data.get('status', 'active'),
-        speed_knots=float(ship_data.get('speed', 12.0)),
-        cargo_weight=float(ship_data.get('cargo', 1000.0))
-    )
+    """Convert EUM ship data to ShipInfo format (trusted upstream data, no validation)"""
+    row = {**SHIPINFO_DEFAULTS, **ship_data}
+    row.update({key: float(row[key]) for key in SHIPINFO_FLOAT_FIELDS})
+    row["id"] = index
+    row["shipId"] = str(ship_data.get('devId', f'ship_{index}'))
+    row.setdefault("name", f'Ship {index}')
+    return ShipInfo.model_construct(**row)
 
 @app.get("/api/eum/ships/live", response_model=List[ShipInfo])
 async def get_live_ships():
     """Get ships directly from EUM API (Live mode)"""
-    global eum_client
 
     # Fetch fresh data from EUM API
     ships_data = eum_client.get_ship_list()
 
-    # Convert to ShipInfo format
-    return [convert_eum_ship_to_shipinfo(ship, i) for i, ship in enumerate(ships_data)]
+    # Convert to ShipInfo format; response_model is kept for the OpenAPI schema only
+    return ORJSONResponse(content=[
+        convert_eum_ship_to_shipinfo(ship, i).dict() for i, ship in enumerate(ships_data)
+    ])
+
+def live_location_row(loc: dict, now_iso: str) -> Optional[dict]:
+    """Coerce one EUM realtime record to a ShipRealtimeLocation dict, or None if malformed"""
+    try:
+        return {
+            "logDateTime": loc.get('logDateTime', now_iso),
+            "devId": int(loc.get('devId', 0)),
+            "rcvDateTime": loc.get('rcvDateTime', now_iso),
+            "lati": float(loc.get('lati', 36.0)),
+            "longi": float(loc.get('longi', 129.4)),
+            "azimuth": float(loc.get('azimuth', 0)),
+            "course": float(loc.get('course', 0)),
+            "speed": float(loc.get('speed', 0))
+        }
+    except (ValueError, TypeError) as e:
+        print(f"Error converting location data: {e}")
+        return None
+
 
 @app.get("/api/eum/ships/realtime/live", response_model=List[ShipRealtimeLocation])
 async def get_live_realtime_locations():
     """Get real-time ship locations directly from EUM API (Live mode)"""
-    global eum_client
-    from datetime import datetime
 
     # Fetch fresh real-time data from API
     locations = eum_client.get_ship_realtime_location()
+    now_iso = datetime.now().isoformat()
 
-    # Convert to response format
-    result = []
-    for loc in locations:
-        try:
-            result.append(ShipRealtimeLocation(
-                logDateTime=loc.get('logDateTime', datetime.now().isoformat()),
-                devId=int(loc.get('devId', 0)),
-                rcvDateTime=loc.get('rcvDateTime', datetime.now().isoformat()),
-                lati=float(loc.get('lati', 36.0)),
-                longi=float(loc.get('longi', 129.4)),
-                azimuth=float(loc.get('azimuth', 0)),
-                course=float(loc.get('course', 0)),
-                speed=float(loc.get('speed', 0))
-            ))
-        except (ValueError, TypeError) as e:
-            print(f"Error converting location data: {e}")
-            continue
-
-    return result
+    # Convert to response format, dropping records that fail coercion
+    rows = [live_location_row(loc, now_iso) for loc in locations]
+    return ORJSONResponse(content=[row for row in rows if row is not None])
 
-@app.get("/api/eum/ships/realtime/demo", response_model=List[ShipRealtimeLocation])
-async def get_demo_realtime_locations(db: Session = Depends(get_db)):
-    """Get demo ship locations at their fixed positions"""
-    from datetime import datetime
+# (devId, lat, lng) of the demo ships; their positions are fixed for the process lifetime
+demo_ship_positions = None
 
-    # Get first 10 ships from DB (aligned with init data)
-    ships = db.query(DBShip).limit(10).all()
 
-    # Map EUM IDs to SHIP IDs for frontend compatibility
-    id_mapping = {
-        'EUM001': 'SHIP001', 'EUM002': 'SHIP002', 'EUM003': 'SHIP003',
-        'EUM004': 'SHIP004', 'EUM005': 'SHIP005', 'EUM006': 'SHIP006',
-        'EUM007': 'SHIP007', 'EUM008': 'SHIP008', 'EUM009': 'SHIP009',
-        'EUM010': 'SHIP010'
-    }
-
-    result = []
-    for i, ship in enumerate(ships, start=1):
+def get_demo_ship_positions(db: Session) -> list:
+    """Load the first 10 ships' positions once (aligned with init data)"""
+    global demo_ship_positions
+    if demo_ship_positions is None:
+        rows = db.query(DBShip.latitude, DBShip.longitude).limit(10).all()
         # Use index as devId for compatibility with ShipRealtimeLocation model
         # Frontend will map this to SHIP IDs
+        demo_ship_positions = [
+            (i, float(lat), float(lng)) for i, (lat, lng) in enumerate(rows, start=1)
+        ]
+    return demo_ship_positions
 
-        # Use actual latitude and longitude from database (current position)
-        # This ensures ships stay at their designated positions
-        result.append(ShipRealtimeLocation(
-            logDateTime=datetime.now().isoformat(),
-            devId=i,  # Use numeric ID
-            rcvDateTime=datetime.now().isoformat(),
-            lati=float(ship.latitude),  # Use actual position from DB
-            longi=float(ship.longitude),  # Use actual position from DB
-            azimuth=0.0,  # No rotation
-            course=0.0,  # No movement
-            speed=0.0  # Stationary
-        ))
-
-    return result
 
-@app.get("/api/eum/ships/routes", response_model=List[ShipRouteModel])
-async def get_ship_routes(db: Session = Depends(get_db)):
-    """Get ship routes from generated routes with obstacle avoidance"""
-    import sqlite3
-    import json
-    from datetime import datetime
+@app.get("/api/eum/ships/realtime/demo", response_model=List[ShipRealtimeLocation])
+async def get_demo_realtime_locations(db: Session = Depends(get_db)):
+    """Get demo ship locations at their fixed positions"""
 
-    # Connect to the database and get actual routes
-    conn = sqlite3.connect('ship_routes.db')
-    cursor = conn.cursor()
+    now_iso = datetime.now().isoformat()
 
-    # Get routes from ship_routes_simulation table
-    cursor.execute("""
-        SELECT ship_id, ship_name, departure_time, arrival_time,
-               path, speed_knots, direction
-        FROM ship_routes_simulation
-        ORDER BY ship_id
-    """)
+    # Use actual latitude and longitude from database (current position)
+    # This ensures ships stay at their designated positions
+    return ORJSONResponse(content=[
+        {
+            "logDateTime": now_iso,
+            "devId": i,  # Use numeric ID
+            "rcvDateTime": now_iso,
+            "lati": lat,
+            "longi": lng,
+            "azimuth": 0.0,  # No rotation
+            "course": 0.0,  # No movement
+            "speed": 0.0  # Stationary
+        }
+        for i, lat, lng in get_demo_ship_positions(db)
+    ])
 
-    db_routes = cursor.fetchall()
+@app.get("/api/eum/ships/routes", response_model=List[ShipRouteModel])
+async def get_ship_routes(db: Session = Depends(get_db)):
+    """Get ship routes from generated routes with obstacle avoidance"""
+    # Simulation routes with their paths already decoded, by ship id (then departure)
+    db_routes = sorted(load_simulation_routes(db), key=lambda entry: entry["route"]["ship_id"])
     routes = []
 
-    # Get ship info from main ships table for mapping
-    ships = db.query(DBShip).all()
+    # Get ship info from main ships table for mapping (only the columns used below)
+    ships = db.query(DBShip.ship_id, DBShip.id, DBShip.latitude, DBShip.longitude).all()
     ship_map = {ship.ship_id: ship for ship in ships}
 
     # Hardcoded route for EUM001 (reverse of EUM010's path)
     if 'EUM001' in ship_map:
         ship = ship_map['EUM001']
-        # This is the reversed path of EUM010 (from docking to fishing area)
-        eum001_path = [
-            (35.985810, 129.553259),  # Start at docking
-            (35.985210, 129.557459),
-            (35.985010, 129.558059),
-            (35.985610, 129.558659),
-            (35.986210, 129.560259),
-            (35.982610, 129.570659)   # End at fishing area
-        ]
-
-        route = ShipRouteModel(
-            ship_id='EUM001',
-            devId=ship.id,
-            departure_time=0,  # Departure at midnight
-            arrival_time=6,    # 6 minutes journey
-            path_points=eum001_path,
-            current_position=eum001_path[0],
-            speed_knots=10.0,
-            status='active'
-        )
+        route = {
+            "ship_id": 'EUM001',
+            "devId": ship.id,
+            "departure_time": 0.0,  # Departure at midnight
+            "arrival_time": 6.0,    # 6 minutes journey
+            "path_points": EUM001_PATH,
+            "current_position": EUM001_PATH[0],
+            "speed_knots": 10.0,
+            "status": 'active'
+        }
         routes.append(route)
 
-    for db_route in db_routes:
-        ship_id = db_route[0]
-        path_json = db_route[4]
+    for entry in db_routes:
+        db_route = entry["route"]
+        ship_id = db_route["ship_id"]
 
         if ship_id in ship_map:
             ship = ship_map[ship_id]
 
-            # Parse the path
-            path_points = json.loads(path_json) if path_json else []
-
-            # Convert path points to tuples
-            path_tuples = [(point[0], point[1]) for point in path_points]
-
-            # Parse departure time and convert to minutes from midnight
-            departure_str = db_route[2]
-            try:
-                departure_dt = datetime.fromisoformat(departure_str)
-                departure_minutes = departure_dt.hour * 60 + departure_dt.minute
-            except:
-                departure_minutes = 0
-
-            # Parse arrival time
-            arrival_str = db_route[3]
-            try:
-                arrival_dt = datetime.fromisoformat(arrival_str)
-                arrival_minutes = arrival_dt.hour * 60 + arrival_dt.minute
-            except:
+            # Stored [lat, lng] pairs serialize the same as tuples
+            path_points = db_route["path"]
+
+            # Minutes from midnight, from the seconds of day precomputed by the route cache
+            departure_minutes = entry["departure_seconds"] // 60
+            if entry["arrival_seconds"] is not None:
+                arrival_minutes = entry["arrival_seconds"] // 60
+            else:
                 arrival_minutes = departure_minutes + 45
 
-            route = ShipRouteModel(
-                ship_id=ship_id,
-                devId=ship.id,
-                departure_time=departure_minutes,
-                arrival_time=arrival_minutes,
-                path_points=path_tuples,
-                current_position=path_tuples[0] if path_tuples else (ship.latitude, ship.longitude),
-                speed_knots=db_route[5] or 10.0,
-                status='active' if db_route[6] else 'planning'
-            )
+            route = {
+                "ship_id": ship_id,
+                "devId": ship.id,
+                "departure_time": float(departure_minutes),
+                "arrival_time": float(arrival_minutes),
+                "path_points": path_points,
+                "current_position": path_points[0] if path_points else (ship.latitude, ship.longitude),
+                "speed_knots": float(db_route["speed_knots"] or 10.0),
+                "status": 'active' if db_route["direction"] else 'planning'
+            }
             routes.append(route)
 
-    conn.close()
-    return routes
+    return ORJSONResponse(content=routes)
+
+
+# Dummy density grid data
+# In production, this would call the actual API
+DENSITY_GRID = [
+    ShipDensityGrid(
+        gridId="G001",
+        latitude=35.98,
+        longitude=129.56,
+        shipCount=3,
+        densityLevel="low"
+    ).dict(),
+    ShipDensityGrid(
+        gridId="G002",
+        latitude=35.985,
+        longitude=129.558,
+        shipCount=5,
+        densityLevel="medium"
+    ).dict(),
+    ShipDensityGrid(
+        gridId="G003",
+        latitude=35.983,
+        longitude=129.560,
+        shipCount=2,
+        densityLevel="low"
+    ).dict()
+]
 
 
 @app.get("/api/eum/traffic/density")
@@ -1067,61 +1410,54 @@ async def get_ship_density(
     if not start_time:
         start_time = datetime.now().strftime("%H%M")
 
-    # Generate dummy density grid data
-    # In production, this would call the actual API
-    grid_data = [
-        ShipDensityGrid(
-            gridId="G001",
-            latitude=35.98,
-            longitude=129.56,
-            shipCount=3,
-            densityLevel="low"
-        ),
-        ShipDensityGrid(
-            gridId="G002",
-            latitude=35.985,
-            longitude=129.558,
-            shipCount=5,
-            densityLevel="medium"
-        ),
-        ShipDensityGrid(
-            gridId="G003",
-            latitude=35.983,
-            longitude=129.560,
-            shipCount=2,
-            densityLevel="low"
-        )
-    ]
-
-    return {
+    # Already plain data, so skip jsonable_encoder
+    return ORJSONResponse(content={
         "date": start_date,
         "time": start_time,
-        "gridDensity": [grid.dict() for grid in grid_data]
-    }
+        "gridDensity": DENSITY_GRID
+    })
 
 
 @app.get("/api/ships/realtime-with-routes", response_model=List[ShipRealtimeWithRoute])
 async def get_realtime_with_routes(db: Session = Depends(get_db)):
     """Get real-time ship locations combined with their planned routes"""
-    global eum_client
 
-    # Get real-time locations from EUM API
-    realtime_locations = eum_client.get_ship_realtime_location()
+    # Get real-time locations from EUM API in a worker thread
+    # (blocking client) while the route query runs
+    locations_task = asyncio.ensure_future(
+        asyncio.to_thread(eum_client.get_ship_realtime_location)
+    )
 
-    # Get all active routes from our database
-    active_routes = db.query(DBShipRoute).filter(
+    # Get all active routes from our database (only the columns used below)
+    active_routes = db.query(
+        DBShipRoute.ship_id, DBShipRoute.path_points, DBShipRoute.actual_departure,
+        DBShipRoute.arrival_time, DBShipRoute.optimization_mode, DBShipRoute.status,
+        DBShipRoute.path_length_nm, DBShipRoute.speed_knots
+    ).filter(
         DBShipRoute.status.in_(['accepted', 'active'])
     ).all()
 
     # Create a mapping of ship_id to routes for quick lookup
     route_map = {route.ship_id: route for route in active_routes}
 
+    realtime_locations = await locations_task
+
+    # Resolve EUM device IDs to ships in one query
+    dev_ids = {loc['devId'] for loc in realtime_locations}
+    ships_by_id = {
+        s.id: s for s in db.query(DBShip.id, DBShip.ship_id, DBShip.name)
+        .filter(DBShip.id.in_(dev_ids)).all()
+    }
+
+    # Request-invariant clocks: wall time for plan positions, minutes for the time difference
+    current_dt = datetime.now()
+    current_time = time.time() / 60  # Current time in minutes
+
     # Combine real-time locations with routes
     combined_data = []
 
     for location in realtime_locations:
-        # Find the corresponding ship from EUM device ID
-        ship = db.query(DBShip).filter(DBShip.id == location['devId']).first()
+        ship = ships_by_id.get(location['devId'])
 
         if ship:
             # Prepare real-time location data
@@ -1141,9 +1477,14 @@ async def get_realtime_with_routes(db: Session = Depends(get_db)):
             if ship.ship_id in route_map:
                 route = route_map[ship.ship_id]
 
+                # Route is reused across polls until the row changes; timestamps are
+                # anchored at this poll so expected_position matches the request time
+                ship_route = get_cached_ship_route(route.ship_id, ship.name, route.actual_departure,
+                                                   route.speed_knots, route.path_points, current_dt)
+
                 # Convert route to dictionary format
                 planned_route = {
-                    "path_points": route.get_path(),
+                    "path_points": ship_route.path,
                     "departure_time": route.actual_departure,
                     "arrival_time": route.arrival_time,
                     "optimization_mode": route.optimization_mode,
@@ -1154,22 +1495,9 @@ async def get_realtime_with_routes(db: Session = Depends(get_db)):
 
                 # Calculate deviation (simplified version)
                 # In production, this would calculate actual distance from planned path
-                import time
-                current_time = time.time() / 60  # Current time in minutes
 
                 # Calculate where the ship should be based on the plan
-                ship_route = ShipRoute(
-                    name=ship.name if ship else route.ship_id,
-                    ship_id=route.ship_id,
-                    start=(route.start_x, route.start_y),
-                    goal=(route.goal_x, route.goal_y),
-                    path=route.get_path(),
-                    departure_time=route.actual_departure,
-                    speed_knots=route.speed_knots
-                )
-                ship_route.calculate_timestamps()
-
-                expected_position = ship_route.get_position_at_time(current_time)
+                expected_position = ship_route.get_position_at_time(current_dt)
 
                 if expected_position:
                     # Simple deviation calculation (would need proper coordinate conversion)
@@ -1181,29 +1509,29 @@ async def get_realtime_with_routes(db: Session = Depends(get_db)):
                     }
 
             # Create combined data entry
-            combined_entry = ShipRealtimeWithRoute(
-                ship_id=ship.ship_id,
-                dev_id=location['devId'],
-                current_location=current_location,
-                planned_route=planned_route,
-                deviation=deviation
-            )
-            combined_data.append(combined_entry)
+            combined_data.append({
+                "ship_id": ship.ship_id,
+                "dev_id": location['devId'],
+                "current_location": current_location,
+                "planned_route": planned_route,
+                "deviation": deviation
+            })
 
-    return combined_data
+    return ORJSONResponse(content=combined_data)
 
 
 # Chatbot endpoints
-@app.post("/api/chatbot/voice")
-async def process_voice(db: Session = Depends(get_db)):
-    """Process voice input and return response"""
-    from fastapi import File, UploadFile
-    import base64
-    import random
+# Digit extractor for preferred_time strings like "3분", "10m", "2시간"
+DIGIT_PATTERN = re.compile(r'\d+')
 
-    # For now, return mock response
-    # In production, you would use speech recognition here
-    responses = [
+# Words treated as a "yes" reply to a recommendation
+CONFIRM_WORDS = ("네", "좋아", "할게", "예", "ok", "yes")
+
+
+# Mock voice responses, serialized once
+# In production, you would use speech recognition here
+VOICE_RESPONSES = [
+    orjson.dumps(response) for response in (
         {
             "transcript": "현재 선박 상태를 확인해줘",
             "response": "포항 구룡포항에 현재 3척의 선박이 운항 중입니다. 모든 선박이 정상 운항 중이며, 기상 상태는 맑고 파도는 0.5m입니다.",
@@ -1221,18 +1549,23 @@ async def process_voice(db: Session = Depends(get_db)):
                 {"id": "route_plan", "name": "경로 계획", "icon": "🗺️", "action": "plan_route"}
             ]
         }
-    ]
+    )
+]
+
 
-    selected = random.choice(responses)
-    return selected
+@app.post("/api/chatbot/voice")
+async def process_voice(db: Session = Depends(get_db)):
+    """Process voice input and return response"""
+    # For now, return mock response
+    return Response(content=random.choice(VOICE_RESPONSES), media_type="application/json")
 
 
 @app.post("/api/chatbot/text")
 async def process_text(request: dict, db: Session = Depends(get_db)):
     """Process text input with GPT integration"""
-    global chatbot_service
 
     message = request.get("message", "")
+    message_lower = message.lower()
     session_data = request.get("session", {})
 
     if not chatbot_service:
@@ -1317,19 +1650,20 @@ async def process_text(request: dict, db: Session = Depends(get_db)):
         # Parse time preference - default to now if not specified
         user_departure_time = 0  # Default to now
         if preferred_time:
-            import re
             print(f"DEBUG: Parsing preferred_time: {preferred_time}")
-            if preferred_time == "now" or "지금" in str(preferred_time):
+            preferred_str = str(preferred_time)
+            preferred_lower = preferred_str.lower()
+            if preferred_time == "now" or "지금" in preferred_str:
                 user_departure_time = 0
-            elif "분" in str(preferred_time) or "m" in str(preferred_time).lower():
+            elif "분" in preferred_str or "m" in preferred_lower:
                 # Extract minutes - handle both "3분" and "3m" formats
-                minutes = re.findall(r'\d+', str(preferred_time))
+                minutes = DIGIT_PATTERN.findall(preferred_str)
                 print(f"DEBUG: Found minutes: {minutes}")
                 if minutes:
                     user_departure_time = float(minutes[0])  # Already in minutes
-            elif "h" in str(preferred_time).lower() or "시간" in str(preferred_time):
+            elif "h" in preferred_lower or "시간" in preferred_str:
                 # Extract hours
-                hours = re.findall(r'\d+', str(preferred_time))
+                hours = DIGIT_PATTERN.findall(preferred_str)
                 if hours:
                     user_departure_time = float(hours[0]) * 60  # Convert to minutes
 
@@ -1392,7 +1726,7 @@ async def process_text(request: dict, db: Session = Depends(get_db)):
                 }
 
     # Handle user confirmation response (YES - use optimal time)
-    elif any(word in message.lower() for word in ["네", "좋아", "할게", "예", "ok", "yes"]):
+    elif any(word in message_lower for word in CONFIRM_WORDS):
         # Conversational confirm branch removed: rely on JSON function flow only
         pass
 
@@ -1449,12 +1783,6 @@ async def root():
     }
 
 
-# Coordinate system base point (top-left corner of map)
-MAP_ORIGIN = {
-    "lat": 35.993654,  # Top-left latitude
-    "lng": 129.549146  # Top-left longitude
-}
-
 # Map range (we use a large area to cover all possible coordinates)
 # Everything is relative to the top-left origin
 # We assume no coordinates will be north or west of the origin
@@ -1463,14 +1791,19 @@ MAP_ORIGIN = {
 # The coordinate conversion functions are removed as we work directly with lat/lng
 
 
-@app.post("/api/route/departure")
-async def plan_departure_route(
-    request: DepartureRouteRequest,
-    db: Session = Depends(get_db)
-):
-    """Plan route from docking to fishing area (출항)"""
-    ship_id = request.ship_id
-    departure_time = request.departure_time
+# (from area, to area, hardcoded EUM001 path) of each harbor route type
+HARBOR_ROUTE_TYPES = {
+    "departure": ("docking", "fishing", EUM001_DEPARTURE),
+    "arrival": ("fishing", "docking", EUM001_ARRIVAL),
+}
+
+
+def plan_harbor_route(db: Session, ship_id: str, route_type: str,
+                      departure_time: Optional[float], departure_base: datetime) -> ORJSONResponse:
+    """
+    Plan and save a route between a ship's docking and fishing areas.
+    departure_time is in minutes after departure_base.
+    """
     # Force flexible optimization per UX requirement
     flexible_time = True
 
@@ -1483,127 +1816,77 @@ async def plan_departure_route(
         raise HTTPException(status_code=400, detail="Ship doesn't have docking or fishing area defined")
 
     # Use lat/lng coordinates directly
-    start_lat, start_lng = ship.docking_lat, ship.docking_lng
-    goal_lat, goal_lng = ship.fishing_area_lat, ship.fishing_area_lng
+    areas = {
+        "docking": (ship.docking_lat, ship.docking_lng),
+        "fishing": (ship.fishing_area_lat, ship.fishing_area_lng),
+    }
+    from_area, to_area, eum001_path = HARBOR_ROUTE_TYPES[route_type]
+    start_lat, start_lng = areas[from_area]
+    goal_lat, goal_lng = areas[to_area]
 
     # For EUM001, use hardcoded routes (reversed EUM010 path)
     if ship_id == "EUM001":
-        # Use hardcoded departure route
-        optimal_path = [
-            [35.985810, 129.553259],  # Start at docking
-            [35.985210, 129.557459],
-            [35.985010, 129.558059],
-            [35.985610, 129.558659],
-            [35.986210, 129.560259],
-            [35.982610, 129.570659]   # End at fishing area
-        ]
-        # Set optimal time to 3 minutes as requested
-        optimal_time = 3
-        # Calculate distance
-        hardcoded_distance_nm = 0.92  # Based on EUM010 route
+        optimal_path = eum001_path
     else:
         # Get existing ships from simulation table for collision avoidance
         # Load Ships 2-10 routes from ship_routes_simulation table
-        existing_ships = []
-        import sqlite3
-        import json as json_module
-        conn = sqlite3.connect('ship_routes.db')
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT ship_id, ship_name, departure_time, path_points, speed_knots
-            FROM ship_routes_simulation
-            WHERE ship_id != 'SHIP001'
-            ORDER BY departure_time
-        """)
-
-        for row in cursor.fetchall():
-            ship_id_db, ship_name, departure_str, path_json, speed = row
-            path = json_module.loads(path_json)
-            departure_dt = datetime.fromisoformat(departure_str)
-
-            # Create ShipRoute object for collision checking
-            existing_route = ShipRoute(
-                name=ship_name,
-                ship_id=ship_id_db,
-                start=tuple(path[0]) if path else (0, 0),
-                goal=tuple(path[-1]) if path else (0, 0),
-                path=[tuple(p) for p in path],
-                departure_time=departure_dt,
-                speed_knots=speed
-            )
-            existing_route.calculate_timestamps()
-            existing_ships.append(existing_route)
-
-        conn.close()
+        existing_ships = load_simulation_ships(db)
 
         # Find optimal path using lat/lng A* algorithm
-        optimal_path = route_optimizer.find_path_astar(
-            start_lat, start_lng,
-            goal_lat, goal_lng,
-            departure_time=datetime.fromtimestamp(departure_time * 60) if departure_time else None
-        )
+        optimal_path = find_path_cached(start_lat, start_lng, goal_lat, goal_lng)
 
         if not optimal_path:
             raise HTTPException(status_code=400, detail="No valid path found")
 
-    # Create ship route with lat/lng coordinates
-    # Convert departure_time (minutes) to datetime object
-    from datetime import datetime, timedelta, date
     # Use base time (00:00:00) for simulation consistency
-    today = date.today()
-    base_time = datetime.combine(today, datetime.min.time())  # Today at 00:00:00
-    departure_dt = base_time + timedelta(minutes=departure_time if departure_time else 0)
+    base_time = simulation_base_time()
 
+    # Create ship route with lat/lng coordinates
     new_ship = ShipRoute(
-        name=f"{ship.name}_departure",
+        name=f"{ship.name}_{route_type}",
         ship_id=ship_id,
         start=(start_lat, start_lng),
         goal=(goal_lat, goal_lng),
         path=optimal_path,
-        departure_time=departure_dt,
-        speed_knots=ship.speed if hasattr(ship, 'speed') else 10.0
+        departure_time=departure_base + timedelta(minutes=departure_time or 0),
+        # Slightly slower speed for EUM001 (8 knots instead of 10)
+        speed_knots=8.0 if ship_id == "EUM001" else (ship.speed if hasattr(ship, 'speed') else 10.0)
     )
     new_ship.calculate_timestamps()
 
-    # For EUM001, use requested time or default to 3 minutes and adjust speed
+    # For EUM001, use requested time or default to 3 minutes
     if ship_id == "EUM001":
         # Use 3 minutes for chatbot recommendations as requested
         optimal_time = 3
-        # Set slightly slower speed for EUM001 (8 knots instead of 10)
-        new_ship.speed_knots = 8.0
-        # Set departure time based on simulation base time, not current time
-        if departure_time is not None:
-            new_ship.departure_time = base_time + timedelta(minutes=departure_time)
-        else:
-            new_ship.departure_time = base_time + timedelta(minutes=3)
-        new_ship.calculate_timestamps()
+        new_ship.shift_departure(departure_base + timedelta(
+            minutes=departure_time if departure_time is not None else 3))
     # Optimize departure time if flexible
-    elif flexible_time and 'existing_ships' in locals() and existing_ships:
+    elif flexible_time and existing_ships:
         optimal_time = route_optimizer.optimize_departure_time(
             new_ship, existing_ships,
-            time_window_minutes=10  # restrict search window; core limits +3~+10
+            time_window_minutes=10,  # restrict search window; core limits +3~+10
+            # Stacked bbox/time extents kept alongside the cached routes
+            existing_extents=simulation_ships_cache["extents"]
         )
         if optimal_time != departure_time:
-            # Recalculate path with new departure time
-            optimal_path = route_optimizer.find_path_astar(
-                start_lat, start_lng,
-                goal_lat, goal_lng,
-                departure_time=datetime.fromtimestamp(optimal_time * 60)
-            )
-            new_ship.departure_time = optimal_time
-            new_ship.path = optimal_path
-            new_ship.calculate_timestamps()
+            # Recalculate path with new departure time (static obstacles only
+            # shift the timestamps, the path itself stays the same)
+            if route_optimizer.path_depends_on_time:
+                optimal_path = route_optimizer.find_path_astar(
+                    start_lat, start_lng,
+                    goal_lat, goal_lng,
+                    departure_time_minutes=optimal_time
+                )
+                new_ship.path = optimal_path
+                new_ship.departure_time = optimal_time
+                new_ship.calculate_timestamps()
+            else:
+                new_ship.shift_departure(optimal_time)
     else:
         optimal_time = departure_time or 0
 
     # Path is already in lat/lng format
-    path_lat_lng = []
-    for point in optimal_path:
-        path_lat_lng.append({
-            "lat": point[0],
-            "lng": point[1]
-        })
+    path_lat_lng = [{"lat": lat, "lng": lng} for lat, lng in optimal_path]
 
     # Save to database
     save_to_db = True  # Always save to DB for playback
@@ -1611,107 +1894,94 @@ async def plan_departure_route(
         # For EUM001, save to simulation table
         if ship_id == "EUM001":
             # Save to ship_routes_simulation table for Ship 1
-            import sqlite3
-            import json as json_module
-            from datetime import timedelta
-
-            conn = sqlite3.connect('ship_routes.db')
-            cursor = conn.cursor()
 
             # Remove existing route for EUM001
-            cursor.execute("DELETE FROM ship_routes_simulation WHERE ship_id = ?", (ship_id,))
-
-            # Calculate arrival time
-            # Calculate actual distance from the path for EUM001
-            if ship_id == "EUM001":
-                # Calculate distance from path points
-                total_distance_nm = 0
-                from core_optimizer_latlng import haversine_distance
-                for i in range(len(optimal_path) - 1):
-                    dist = haversine_distance(
-                        optimal_path[i][0], optimal_path[i][1],
-                        optimal_path[i+1][0], optimal_path[i+1][1]
-                    )
-                    total_distance_nm += dist
-                distance_nm = total_distance_nm
-                print(f"[DEBUG] EUM001 route - Path points: {len(optimal_path)}, Distance: {distance_nm:.2f} nm")
-            else:
-                distance_nm = new_ship.path_length_nm if hasattr(new_ship, 'path_length_nm') else 0
+            db.execute(text("DELETE FROM ship_routes_simulation WHERE ship_id = :ship_id"),
+                       {"ship_id": ship_id})
+
+            # Calculate arrival time from the hardcoded path distance
+            distance_nm = EUM001_DISTANCE_NM
+            print(f"[DEBUG] EUM001 route - Path points: {len(optimal_path)}, Distance: {distance_nm:.2f} nm")
 
             travel_time_hours = distance_nm / new_ship.speed_knots if new_ship.speed_knots > 0 else 0
 
             # Use same base time as other ships (00:00:00) for simulation
-            from datetime import date
-            today = date.today()
-            base_time = datetime.combine(today, datetime.min.time())  # Today at 00:00:00
             departure_datetime = base_time + timedelta(minutes=optimal_time)
             arrival_datetime = departure_datetime + timedelta(hours=travel_time_hours)
 
             # Insert new route for EUM001
-            cursor.execute("""
+            db.execute(text("""
                 INSERT INTO ship_routes_simulation
                 (ship_id, ship_name, departure_time, arrival_time, path,
                  speed_knots, direction, total_distance_nm)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                ship_id,
-                ship.name,
-                departure_datetime.isoformat(),
-                arrival_datetime.isoformat(),
-                json_module.dumps(optimal_path),
-                new_ship.speed_knots,
-                'to_fishing',  # departure = docking to fishing
-                distance_nm
-            ))
-            print(f"[DEBUG] EUM001 route saved - Distance: {distance_nm:.2f} nm, Travel time: {travel_time_hours:.2f} hours ({travel_time_hours*60:.1f} minutes)")
-
-            conn.commit()
-            conn.close()
-        else:
-            # For other ships, save to regular table
-            existing = db.query(DBShipRoute).filter(DBShipRoute.ship_id == ship_id).first()
-            if existing:
-                db.delete(existing)
-
-            # Create new route in DB
-            db_route = DBShipRoute(
-                ship_id=ship_id,
-                start_lat=ship.docking_lat,
-                start_lng=ship.docking_lng,
-                goal_lat=ship.fishing_area_lat,
-                goal_lng=ship.fishing_area_lng,
-                path=json.dumps(new_ship.path),
-                actual_departure=new_ship.departure_time,
-                recommended_departure=new_ship.departure_time,
-                speed_knots=new_ship.speed_knots,
-                path_length_pixels=new_ship.path_length_pixels if hasattr(new_ship, 'path_length_pixels') else 0,
-                path_length_nm=new_ship.path_length_nm if hasattr(new_ship, 'path_length_nm') else 0,
-                speeds=json.dumps([new_ship.speed_knots] * len(new_ship.path)),
-                status='planned',
-                optimization_mode='flexible' if flexible_time else 'fixed'
-            )
-            db.add(db_route)
+                VALUES (:ship_id, :ship_name, :departure_time, :arrival_time, :path,
+                        :speed_knots, :direction, :total_distance_nm)
+            """), {
+                "ship_id": ship_id,
+                "ship_name": ship.name,
+                "departure_time": departure_datetime.isoformat(),
+                "arrival_time": arrival_datetime.isoformat(),
+                "path": new_ship.path_json(),
+                "speed_knots": new_ship.speed_knots,
+                "direction": f'to_{to_area}',  # departure = to fishing, arrival = to docking
+                "total_distance_nm": distance_nm
+            })
+            print(f"[DEBUG] EUM001 {route_type} route saved - Distance: {distance_nm:.2f} nm, Travel time: {travel_time_hours:.2f} hours ({travel_time_hours*60:.1f} minutes)")
+
             db.commit()
+            invalidate_simulation_caches()
+        else:
+            # For other ships, save to regular table (start/goal columns hold pixel coordinates)
+            start_x, start_y = lat_lng_to_pixel(start_lat, start_lng)
+            goal_x, goal_y = lat_lng_to_pixel(goal_lat, goal_lng)
+            upsert_ship_route(db, {
+                "ship_id": ship_id,
+                "ship_name": ship.name,
+                "start_x": start_x,
+                "start_y": start_y,
+                "goal_x": goal_x,
+                "goal_y": goal_y,
+                "requested_departure": departure_time or 0,
+                "actual_departure": optimal_time,
+                "arrival_time": optimal_time + float(new_ship.time_offsets[-1]) / 60,
+                "speed_knots": new_ship.speed_knots,
+                "path_points": new_ship.path_json(),
+                "path_speeds": orjson.dumps([new_ship.speed_knots] * (len(new_ship.path) - 1)).decode(),
+                "path_length_nm": new_ship.path_length_nm,
+                "status": 'planned',
+                "optimization_mode": 'flexible' if flexible_time else 'fixed'
+            })
 
-    return {
+    return ORJSONResponse(content={
         "success": True,
         "ship_id": ship_id,
         "ship_name": ship.name,
-        "route_type": "departure",
-        "from": {"lat": ship.docking_lat, "lng": ship.docking_lng, "type": "docking"},
-        "to": {"lat": ship.fishing_area_lat, "lng": ship.fishing_area_lng, "type": "fishing"},
+        "route_type": route_type,
+        "from": {"lat": start_lat, "lng": start_lng, "type": from_area},
+        "to": {"lat": goal_lat, "lng": goal_lng, "type": to_area},
         "path": path_lat_lng,
         "path_points": new_ship.path,  # For frontend display
         "departure_time": new_ship.departure_time,
         "recommended_departure": new_ship.departure_time,
         "arrival_time": new_ship.timestamps[-1] if new_ship.timestamps else None,
         "speed_knots": new_ship.speed_knots,
-        "distance_nm": new_ship.path_length_nm if hasattr(new_ship, 'path_length_nm') else 0,
-        "total_distance_nm": new_ship.path_length_nm if hasattr(new_ship, 'path_length_nm') else 0,
+        "distance_nm": new_ship.path_length_nm,
+        "total_distance_nm": new_ship.path_length_nm,
         "flexible_time": flexible_time,
         "optimization_type": "flexible" if flexible_time else "fixed",
         "saved_to_db": save_to_db
-    }
+    })
+
+
+@app.post("/api/route/departure")
+async def plan_departure_route(
+    request: DepartureRouteRequest,
+    db: Session = Depends(get_db)
+):
+    """Plan route from docking to fishing area (출항)"""
+    # Departure times count from the simulation base time, not current time
+    return plan_harbor_route(db, request.ship_id, "departure", request.departure_time,
+                             departure_base=simulation_base_time())
 
 
 @app.post("/api/route/arrival")
@@ -1720,271 +1990,33 @@ async def plan_arrival_route(
     db: Session = Depends(get_db)
 ):
     """Plan route from fishing area to docking (입항)"""
-    ship_id = request.ship_id
-    departure_time = request.departure_time
-    # Force flexible optimization per UX requirement
-    flexible_time = True
-
-    # Get ship information
-    ship = db.query(DBShip).filter(DBShip.ship_id == ship_id).first()
-    if not ship:
-        raise HTTPException(status_code=404, detail=f"Ship {ship_id} not found")
-
-    if not ship.docking_lat or not ship.fishing_area_lat:
-        raise HTTPException(status_code=400, detail="Ship doesn't have docking or fishing area defined")
-
-    # Use lat/lng coordinates directly (reverse of departure)
-    start_lat, start_lng = ship.fishing_area_lat, ship.fishing_area_lng
-    goal_lat, goal_lng = ship.docking_lat, ship.docking_lng
-
-    # For EUM001, use hardcoded routes (reversed EUM010 path)
-    if ship_id == "EUM001":
-        # Use hardcoded arrival route (reverse of departure)
-        optimal_path = [
-            [35.982610, 129.570659],  # Start at fishing area
-            [35.986210, 129.560259],
-            [35.985610, 129.558659],
-            [35.985010, 129.558059],
-            [35.985210, 129.557459],
-            [35.985810, 129.553259]   # End at docking
-        ]
-        # Set optimal time to 3 minutes as requested
-        optimal_time = 3
-        # Calculate distance
-        hardcoded_distance_nm = 0.92  # Based on EUM010 route
-    else:
-        # Get existing ships from simulation table for collision avoidance
-        # Load Ships 2-10 routes from ship_routes_simulation table
-        existing_ships = []
-        import sqlite3
-        import json as json_module
-        conn = sqlite3.connect('ship_routes.db')
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT ship_id, ship_name, departure_time, path_points, speed_knots
-            FROM ship_routes_simulation
-            WHERE ship_id != 'SHIP001'
-            ORDER BY departure_time
-        """)
-
-        for row in cursor.fetchall():
-            ship_id_db, ship_name, departure_str, path_json, speed = row
-            path = json_module.loads(path_json)
-            departure_dt = datetime.fromisoformat(departure_str)
-
-            # Create ShipRoute object for collision checking
-            existing_route = ShipRoute(
-                name=ship_name,
-                ship_id=ship_id_db,
-                start=tuple(path[0]) if path else (0, 0),
-                goal=tuple(path[-1]) if path else (0, 0),
-                path=[tuple(p) for p in path],
-                departure_time=departure_dt,
-                speed_knots=speed
-            )
-            existing_route.calculate_timestamps()
-            existing_ships.append(existing_route)
-
-        conn.close()
-
-        # Find optimal path using lat/lng A* algorithm
-        optimal_path = route_optimizer.find_path_astar(
-            start_lat, start_lng,
-            goal_lat, goal_lng,
-            departure_time=datetime.fromtimestamp(departure_time * 60) if departure_time else None
-        )
-
-        if not optimal_path:
-            raise HTTPException(status_code=400, detail="No valid path found")
-
-    # Create ship route with lat/lng coordinates
-    new_ship = ShipRoute(
-        name=f"{ship.name}_arrival",
-        ship_id=ship_id,
-        start=(start_lat, start_lng),
-        goal=(goal_lat, goal_lng),
-        path=optimal_path,
-        departure_time=departure_time or 0,
-        speed_knots=ship.speed if hasattr(ship, 'speed') else 10.0
-    )
-    new_ship.calculate_timestamps()
-
-    # For EUM001, use requested time or default to 3 minutes and adjust speed
-    if ship_id == "EUM001":
-        # Use 3 minutes for chatbot recommendations as requested
-        optimal_time = 3
-        # Set slightly slower speed for EUM001 (8 knots instead of 10)
-        new_ship.speed_knots = 8.0
-        # But use actual departure_time for setting the route
-        if departure_time is not None:
-            new_ship.departure_time = datetime.now() + timedelta(minutes=departure_time)
-        else:
-            new_ship.departure_time = datetime.now() + timedelta(minutes=3)
-        new_ship.calculate_timestamps()
-    # Optimize departure time if flexible
-    elif flexible_time and 'existing_ships' in locals() and existing_ships:
-        optimal_time = route_optimizer.optimize_departure_time(
-            new_ship, existing_ships,
-            time_window_minutes=10  # restrict search window; core limits +3~+10
-        )
-        if optimal_time != departure_time:
-            # Recalculate path with new departure time
-            optimal_path = route_optimizer.find_path_astar(
-                start_lat, start_lng,
-                goal_lat, goal_lng,
-                departure_time=datetime.fromtimestamp(optimal_time * 60)
-            )
-            new_ship.departure_time = optimal_time
-            new_ship.path = optimal_path
-            new_ship.calculate_timestamps()
-    else:
-        optimal_time = departure_time or 0
-
-    # Path is already in lat/lng format
-    path_lat_lng = []
-    for point in optimal_path:
-        path_lat_lng.append({
-            "lat": point[0],
-            "lng": point[1]
-        })
-
-    # Save to database
-    save_to_db = True  # Always save to DB for playback
-    if save_to_db:
-        # For EUM001, save to simulation table
-        if ship_id == "EUM001":
-            # Save to ship_routes_simulation table for Ship 1
-            import sqlite3
-            import json as json_module
-            from datetime import timedelta
-
-            conn = sqlite3.connect('ship_routes.db')
-            cursor = conn.cursor()
-
-            # Remove existing route for EUM001
-            cursor.execute("DELETE FROM ship_routes_simulation WHERE ship_id = ?", (ship_id,))
-
-            # Calculate arrival time
-            # Calculate actual distance from the path for EUM001
-            if ship_id == "EUM001":
-                # Calculate distance from path points
-                total_distance_nm = 0
-                from core_optimizer_latlng import haversine_distance
-                for i in range(len(optimal_path) - 1):
-                    dist = haversine_distance(
-                        optimal_path[i][0], optimal_path[i][1],
-                        optimal_path[i+1][0], optimal_path[i+1][1]
-                    )
-                    total_distance_nm += dist
-                distance_nm = total_distance_nm
-                print(f"[DEBUG] EUM001 route - Path points: {len(optimal_path)}, Distance: {distance_nm:.2f} nm")
-            else:
-                distance_nm = new_ship.path_length_nm if hasattr(new_ship, 'path_length_nm') else 0
-
-            travel_time_hours = distance_nm / new_ship.speed_knots if new_ship.speed_knots > 0 else 0
-
-            # Use same base time as other ships (00:00:00) for simulation
-            from datetime import date
-            today = date.today()
-            base_time = datetime.combine(today, datetime.min.time())  # Today at 00:00:00
-            departure_datetime = base_time + timedelta(minutes=optimal_time)
-            arrival_datetime = departure_datetime + timedelta(hours=travel_time_hours)
-
-            # Insert new route for EUM001
-            cursor.execute("""
-                INSERT INTO ship_routes_simulation
-                (ship_id, ship_name, departure_time, arrival_time, path,
-                 speed_knots, direction, total_distance_nm)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                ship_id,
-                ship.name,
-                departure_datetime.isoformat(),
-                arrival_datetime.isoformat(),
-                json_module.dumps(optimal_path),
-                new_ship.speed_knots,
-                'to_docking',  # arrival = fishing to docking
-                distance_nm
-            ))
-            print(f"[DEBUG] EUM001 arrival route saved - Distance: {distance_nm:.2f} nm, Travel time: {travel_time_hours:.2f} hours ({travel_time_hours*60:.1f} minutes)")
-
-            conn.commit()
-            conn.close()
-        else:
-            # For other ships, save to regular table
-            existing = db.query(DBShipRoute).filter(DBShipRoute.ship_id == ship_id).first()
-            if existing:
-                db.delete(existing)
-
-            # Create new route in DB
-            db_route = DBShipRoute(
-                ship_id=ship_id,
-                start_lat=ship.fishing_area_lat,
-                start_lng=ship.fishing_area_lng,
-                goal_lat=ship.docking_lat,
-                goal_lng=ship.docking_lng,
-                path=json.dumps(new_ship.path),
-                actual_departure=new_ship.departure_time,
-                recommended_departure=new_ship.departure_time,
-                speed_knots=new_ship.speed_knots,
-                path_length_pixels=new_ship.path_length_pixels if hasattr(new_ship, 'path_length_pixels') else 0,
-                path_length_nm=new_ship.path_length_nm if hasattr(new_ship, 'path_length_nm') else 0,
-                speeds=json.dumps([new_ship.speed_knots] * len(new_ship.path)),
-                status='planned',
-                optimization_mode='flexible' if flexible_time else 'fixed'
-            )
-            db.add(db_route)
-            db.commit()
-
-    return {
-        "success": True,
-        "ship_id": ship_id,
-        "ship_name": ship.name,
-        "route_type": "arrival",
-        "from": {"lat": ship.fishing_area_lat, "lng": ship.fishing_area_lng, "type": "fishing"},
-        "to": {"lat": ship.docking_lat, "lng": ship.docking_lng, "type": "docking"},
-        "path": path_lat_lng,
-        "path_points": new_ship.path,  # For frontend display
-        "departure_time": new_ship.departure_time,
-        "recommended_departure": new_ship.departure_time,
-        "arrival_time": new_ship.timestamps[-1] if new_ship.timestamps else None,
-        "speed_knots": new_ship.speed_knots,
-        "distance_nm": new_ship.path_length_nm if hasattr(new_ship, 'path_length_nm') else 0,
-        "total_distance_nm": new_ship.path_length_nm if hasattr(new_ship, 'path_length_nm') else 0,
-        "flexible_time": flexible_time,
-        "optimization_type": "flexible" if flexible_time else "fixed",
-        "saved_to_db": save_to_db
-    }
+    # Arrival departure times count from now
+    return plan_harbor_route(db, request.ship_id, "arrival", request.departure_time,
+                             departure_base=datetime.now())
 
 
 @app.get("/api/obstacles/locations")
 async def get_obstacle_locations(db: Session = Depends(get_db)):
     """Get all fishing areas and docking positions as obstacles"""
 
-    ships = db.query(DBShip).all()
-
-    fishing_areas = []
-    docking_areas = []
+    ships = db.query(
+        DBShip.name, DBShip.fishing_area_lat, DBShip.fishing_area_lng,
+        DBShip.docking_lat, DBShip.docking_lng
+    ).all()
 
-    for ship in ships:
-        if ship.fishing_area_lat and ship.fishing_area_lng:
-            pixel = lat_lng_to_pixel(ship.fishing_area_lat, ship.fishing_area_lng)
-            fishing_areas.append({
-                "ship_name": ship.name,
-                "lat": ship.fishing_area_lat,
-                "lng": ship.fishing_area_lng,
-                "pixel": {"x": pixel[0], "y": pixel[1]}
-            })
+    def area_markers(areas):
+        # One vectorized pixel conversion for all (name, lat, lng) areas
+        areas = [area for area in areas if area[1] and area[2]]
+        if not areas:
+            return []
+        pixels = lat_lng_to_pixels([(lat, lng) for _, lat, lng in areas]).tolist()
+        return [
+            {"ship_name": name, "lat": lat, "lng": lng, "pixel": {"x": x, "y": y}}
+            for (name, lat, lng), (x, y) in zip(areas, pixels)
+        ]
 
-        if ship.docking_lat and ship.docking_lng:
-            pixel = lat_lng_to_pixel(ship.docking_lat, ship.docking_lng)
-            docking_areas.append({
-                "ship_name": ship.name,
-                "lat": ship.docking_lat,
-                "lng": ship.docking_lng,
-                "pixel": {"x": pixel[0], "y": pixel[1]}
-            })
+    fishing_areas = area_markers([(s.name, s.fishing_area_lat, s.fishing_area_lng) for s in ships])
+    docking_areas = area_markers([(s.name, s.docking_lat, s.docking_lng) for s in ships])
 
     return {
         "fishing_areas": fishing_areas,
@@ -2066,12 +2098,13 @@ async def get_all_sos_alerts(
 
 
 @app.get("/api/sos/active", response_model=List[SOSResponse])
-async def get_active_sos_alerts(db: Session = Depends(get_db)):
+async def get_active_sos_alerts(db: AsyncSession = Depends(get_async_db)):
     """Get all active SOS alerts"""
 
-    alerts = db.query(DBSOSAlert).filter(
-        DBSOSAlert.status == 'active'
-    ).order_by(DBSOSAlert.created_at.desc()).all()
+    alerts = (await db.execute(
+        select(DBSOSAlert).where(DBSOSAlert.status == 'active')
+        .order_by(DBSOSAlert.created_at.desc())
+    )).scalars().all()
 
     return [
         SOSResponse(
@@ -2199,37 +2232,32 @@ async def get_messages(
     ship_id: Optional[str] = None,
     unread_only: bool = False,
     limit: int = 50,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get messages for a specific ship or control center"""
 
-    from sqlalchemy import or_, and_
-
-    query = db.query(DBMessage)
-
-    if ship_id:
-        # Get messages where ship is sender or recipient
-        query = query.filter(
-            or_(
-                DBMessage.sender_id == ship_id,
-                DBMessage.recipient_id == ship_id,
-                DBMessage.recipient_id == 'all'
-            )
-        )
-    else:
-        # Get messages for control center
-        query = query.filter(
-            or_(
-                DBMessage.recipient_id == 'control_center',
-                DBMessage.sender_id == 'control_center',
-                DBMessage.recipient_id == 'all'
-            )
-        )
-
+    # Messages where the ship (or control center) is sender or recipient, plus broadcasts
+    participant_id = ship_id or 'control_center'
+    conditions = [
+        DBMessage.sender_id == participant_id,
+        DBMessage.recipient_id == participant_id,
+        DBMessage.recipient_id == 'all'
+    ]
     if unread_only:
-        query = query.filter(DBMessage.is_read == False)
+        conditions = [and_(condition, DBMessage.is_read == False) for condition in conditions]
 
-    messages = query.order_by(DBMessage.created_at.desc()).limit(limit).all()
+    # Newest `limit` ids per condition, each read backwards from its (column, created_at) index
+    latest = [
+        select(DBMessage.id).where(condition)
+        .order_by(DBMessage.created_at.desc()).limit(limit).subquery()
+        for condition in conditions
+    ]
+    candidate_ids = union(*(select(subquery.c.id) for subquery in latest))
+
+    messages = (await db.execute(
+        select(DBMessage).where(DBMessage.id.in_(candidate_ids))
+        .order_by(DBMessage.created_at.desc()).limit(limit)
+    )).scalars().all()
 
     return [
         MessageResponse(
@@ -2251,25 +2279,23 @@ async def get_messages(
 @app.get("/api/messages/unread-count")
 async def get_unread_count(
     ship_id: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get count of unread messages"""
 
-    from sqlalchemy import or_
-
-    query = db.query(DBMessage).filter(DBMessage.is_read == False)
+    query = select(func.count(DBMessage.id)).where(DBMessage.is_read == False)
 
     if ship_id:
-        query = query.filter(
+        query = query.where(
             or_(
                 DBMessage.recipient_id == ship_id,
                 DBMessage.recipient_id == 'all'
             )
         )
     else:
-        query = query.filter(DBMessage.recipient_id == 'control_center')
+        query = query.where(DBMessage.recipient_id == 'control_center')
 
-    count = query.count()
+    count = (await db.execute(query)).scalar()
 
     return {"unread_count": count}
 
@@ -2281,15 +2307,13 @@ async def mark_messages_read(
 ):
     """Mark messages as read"""
 
-    messages = db.query(DBMessage).filter(DBMessage.id.in_(request.message_ids)).all()
-
-    for msg in messages:
-        msg.is_read = True
-        msg.read_at = datetime.utcnow()
-
+    updated = db.query(DBMessage).filter(DBMessage.id.in_(request.message_ids)).update(
+        {DBMessage.is_read: True, DBMessage.read_at: datetime.utcnow()},
+        synchronize_session=False
+    )
     db.commit()
 
-    return {"message": f"{len(messages)} messages marked as read"}
+    return {"message": f"{updated} messages marked as read"}
 
 
 @app.delete("/api/messages/{message_id}")
@@ -2318,15 +2342,33 @@ async def delete_message(
 simulation_state = {
     "is_running": False,
     "start_time": None,
-    "simulation_time": None,
+    "start_mono": None,  # time.monotonic() at start, for elapsed real time
+    "sim_seconds": None,  # Simulated seconds since SIMULATION_EPOCH (None until started)
     "speed_multiplier": 1.0,  # 1x, 2x, 4x speed
     "elapsed_minutes": 0  # Track elapsed simulation minutes
 }
 
+# Simulation world clock starts on a FIXED date to match DB routes (date-independent operation)
+SIMULATION_EPOCH = datetime(2000, 1, 1, 0, 0, 0)
+
+
+def advance_simulation_clock() -> Optional[float]:
+    """Bring the simulation clock up to now if running; simulated seconds since SIMULATION_EPOCH"""
+    if simulation_state["is_running"] and simulation_state["start_mono"] is not None:
+        sim_seconds = (time.monotonic() - simulation_state["start_mono"]) * simulation_state["speed_multiplier"]
+        simulation_state["sim_seconds"] = sim_seconds
+        simulation_state["elapsed_minutes"] = sim_seconds / 60.0
+    return simulation_state["sim_seconds"]
+
+
+def simulation_datetime(sim_seconds: float) -> datetime:
+    """Simulation world time for a simulation clock reading"""
+    return SIMULATION_EPOCH + timedelta(seconds=sim_seconds)
+
+
 @app.post("/api/simulation/start")
 async def start_simulation(request: dict = {}):
     """Start the simulation"""
-    global simulation_state
 
     speed = request.get("speed_multiplier", 1.0)
 
@@ -2335,12 +2377,11 @@ async def start_simulation(request: dict = {}):
         simulation_state["speed_multiplier"] = speed
         return {"status": "speed_updated", "speed_multiplier": speed}
 
-    # Start fresh simulation with FIXED date (2000-01-01) to match DB routes
-    # This ensures date-independent operation
-    base_time = datetime(2000, 1, 1, 0, 0, 0)  # Start at 2000-01-01 00:00:00
+    # Start fresh simulation at SIMULATION_EPOCH (2000-01-01 00:00:00)
     simulation_state["is_running"] = True
     simulation_state["start_time"] = datetime.now()  # Real world start time
-    simulation_state["simulation_time"] = base_time  # Simulation world time (fixed date)
+    simulation_state["start_mono"] = time.monotonic()
+    simulation_state["sim_seconds"] = 0.0
     simulation_state["speed_multiplier"] = speed
     simulation_state["elapsed_minutes"] = 0
 
@@ -2349,31 +2390,27 @@ async def start_simulation(request: dict = {}):
 @app.post("/api/simulation/stop")
 async def stop_simulation():
     """Stop/Pause the simulation"""
-    global simulation_state
 
     simulation_state["is_running"] = False
 
     return {"status": "stopped"}
 
 @app.post("/api/simulation/reset")
-async def reset_simulation():
+async def reset_simulation(db: Session = Depends(get_db)):
     """Reset simulation to initial state"""
-    global simulation_state
 
     simulation_state["is_running"] = False
     simulation_state["start_time"] = None
-    simulation_state["simulation_time"] = None
+    simulation_state["start_mono"] = None
+    simulation_state["sim_seconds"] = None
     simulation_state["speed_multiplier"] = 1.0
     simulation_state["elapsed_minutes"] = 0
 
     # Also clear EUM001 route from database when reset is clicked
-    import sqlite3
     try:
-        conn = sqlite3.connect('ship_routes.db')
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM ship_routes_simulation WHERE ship_id = 'EUM001'")
-        conn.commit()
-        conn.close()
+        db.execute(text("DELETE FROM ship_routes_simulation WHERE ship_id = 'EUM001'"))
+        db.commit()
+        invalidate_simulation_caches()
         return {"status": "reset", "eum001_cleared": True}
     except Exception as e:
         print(f"Error clearing EUM001 route: {e}")
@@ -2384,307 +2421,151 @@ async def reset_simulation():
 @app.get("/api/simulation/status")
 async def get_simulation_status():
     """Get current simulation status"""
-    global simulation_state
-    from datetime import timedelta
 
     # Update simulation time if running
-    if simulation_state["is_running"] and simulation_state["start_time"]:
-        # Calculate elapsed real time in seconds
-        elapsed_real_seconds = (datetime.now() - simulation_state["start_time"]).total_seconds()
-        # Convert to simulation minutes based on speed multiplier
-        elapsed_sim_minutes = (elapsed_real_seconds / 60.0) * simulation_state["speed_multiplier"]
-        simulation_state["elapsed_minutes"] = elapsed_sim_minutes
-
-        # Update simulation time with FIXED date (2000-01-01) to match DB routes
-        base_time = datetime(2000, 1, 1, 0, 0, 0)
-        simulation_state["simulation_time"] = base_time + timedelta(minutes=elapsed_sim_minutes)
+    sim_seconds = advance_simulation_clock()
 
     return {
         "is_running": simulation_state["is_running"],
-        "simulation_time": simulation_state["simulation_time"].isoformat() if simulation_state["simulation_time"] else None,
+        "simulation_time": simulation_datetime(sim_seconds).isoformat() if sim_seconds is not None else None,
         "start_time": simulation_state["start_time"].isoformat() if simulation_state["start_time"] else None,
         "speed_multiplier": simulation_state["speed_multiplier"],
         "elapsed_minutes": simulation_state["elapsed_minutes"]
     }
 
-@app.get("/api/simulation/ship-positions")
+@app.get("/api/simulation/ship-positions", response_model=List[ShipRealtimeLocation])
 async def get_simulation_ship_positions(db: Session = Depends(get_db)):
     """Get ship positions based on simulation time and routes"""
-    global simulation_state
-    from datetime import timedelta
 
     # Update simulation time if running
-    if simulation_state["is_running"] and simulation_state["start_time"]:
-        elapsed_real_seconds = (datetime.now() - simulation_state["start_time"]).total_seconds()
-        elapsed_sim_minutes = (elapsed_real_seconds / 60.0) * simulation_state["speed_multiplier"]
-        simulation_state["elapsed_minutes"] = elapsed_sim_minutes
-
-        # Use FIXED base_time (2000-01-01) to match DB routes
-        # This ensures date-independent operation
-        base_time = datetime(2000, 1, 1, 0, 0, 0)
-        simulation_state["simulation_time"] = base_time + timedelta(minutes=elapsed_sim_minutes)
+    sim_seconds = advance_simulation_clock()
 
-    if not simulation_state["simulation_time"]:
+    if sim_seconds is None:
         # Return current positions if simulation not started
         return await get_demo_realtime_locations(db)
 
-    current_time = simulation_state["simulation_time"]
+    # Compare ONLY time of day (seconds from midnight) - completely ignore dates
+    current_seconds = int(sim_seconds) % 86400
 
-    # Get all ship routes from simulation table
-    conn = sqlite3.connect('ship_routes.db')
-    cursor = conn.cursor()
+    # Position every ship with a simulation route in one vectorized pass
+    load_simulation_routes(db)
+    fleet = simulation_routes_cache["fleet"]
+    lats, lngs, moving = simulation_fleet_positions(fleet, current_seconds)
 
-    cursor.execute("""
-        SELECT ship_id, ship_name, departure_time, arrival_time,
-               path, speed_knots, direction
-        FROM ship_routes_simulation
-        ORDER BY departure_time
-    """)
-
-    routes = cursor.fetchall()
-    positions = []
-
-    for route in routes:
-        ship_id, ship_name, departure_str, arrival_str, path_json, speed, direction = route
-        departure_time = datetime.fromisoformat(departure_str)
-        arrival_time = datetime.fromisoformat(arrival_str) if arrival_str else None
-        path = json.loads(path_json)
-
-        # Extract ONLY time components (HH:MM:SS) - completely ignore dates
-        current_time_only = current_time.time()
-        departure_time_only = departure_time.time()
-        arrival_time_only = arrival_time.time() if arrival_time else None
-
-        # Convert time-only values to total seconds from midnight for comparison
-        def time_to_seconds(t):
-            return t.hour * 3600 + t.minute * 60 + t.second
-
-        current_seconds = time_to_seconds(current_time_only)
-        departure_seconds = time_to_seconds(departure_time_only)
-        arrival_seconds = time_to_seconds(arrival_time_only) if arrival_time_only else None
-
-        # Debug logging for EUM001
-        if ship_id == 'EUM001':
-            print(f"[DEBUG] EUM001 - Departure: {departure_time_only}, Current: {current_time_only}")
-            print(f"[DEBUG] EUM001 - Seconds - Current: {current_seconds}, Departure: {departure_seconds}")
-
-        # Calculate current position based on time-only (completely date-independent)
-        if current_seconds < departure_seconds:
-            # Ship hasn't departed yet - use start position
-            lat, lng = path[0]
-            is_moving = False
-        elif arrival_seconds and current_seconds >= arrival_seconds:
-            # Ship has arrived - use end position
-            lat, lng = path[-1]
-            is_moving = False
-        else:
-            # Ship is in transit - interpolate position
-            elapsed_seconds = current_seconds - departure_seconds
-            elapsed_hours = elapsed_seconds / 3600.0
-            distance_traveled = speed * elapsed_hours  # nautical miles
-
-            # Find position along path
-            total_distance = 0
-            lat, lng = path[0]
-            is_moving = True
-
-            for i in range(len(path) - 1):
-                from core_optimizer_latlng import haversine_distance
-                segment_distance = haversine_distance(
-                    path[i][0], path[i][1],
-                    path[i+1][0], path[i+1][1]
-                )
-
-                if total_distance + segment_distance >= distance_traveled:
-                    # Ship is on this segment
-                    fraction = (distance_traveled - total_distance) / segment_distance
-                    lat = path[i][0] + (path[i+1][0] - path[i][0]) * fraction
-                    lng = path[i][1] + (path[i+1][1] - path[i][1]) * fraction
-                    break
+    # Debug logging for EUM001
+    if 'EUM001' in fleet["ship_ids"]:
+        k = fleet["ship_ids"].index('EUM001')
+        print(f"[DEBUG] EUM001 - Departure: {int(fleet['departure_seconds'][k])}s, Current: {clock_hhmm(current_seconds)}")
+        print(f"[DEBUG] EUM001 - Seconds - Current: {current_seconds}, Departure: {int(fleet['departure_seconds'][k])}")
 
-                total_distance += segment_distance
-            else:
-                # Ship has reached the end
-                lat, lng = path[-1]
-                is_moving = False
-
-        # Get ship ID number for devId
-        # Handle both EUM and SHIP prefixes
-        if 'EUM' in ship_id:
-            ship_num = int(ship_id.replace('EUM', ''))
-        else:
-            ship_num = int(ship_id.replace('SHIP', ''))
-
-        positions.append(ShipRealtimeLocation(
-            logDateTime=current_time.isoformat(),
-            devId=ship_num,
-            rcvDateTime=current_time.isoformat(),
-            lati=lat,
-            longi=lng,
-            azimuth=0.0,
-            course=0.0,
-            speed=speed if is_moving else 0.0
-        ))
+    current_iso = simulation_datetime(sim_seconds).isoformat()
+    # Plain dicts in ShipRealtimeLocation shape; the values are already typed, so skip validation
+    positions = [
+        {
+            "logDateTime": current_iso,
+            "devId": dev_id,
+            "rcvDateTime": current_iso,
+            "lati": lat,
+            "longi": lng,
+            "azimuth": 0.0,
+            "course": 0.0,
+            "speed": speed if is_moving else 0.0
+        }
+        for dev_id, lat, lng, speed, is_moving in zip(
+            fleet["dev_ids"], lats.tolist(), lngs.tolist(), fleet["speeds"].tolist(), moving.tolist())
+    ]
 
     # If Ship 1 doesn't have a route in simulation table, add it as stationary
-    # Otherwise, Ship 1's position was already calculated in the loop above
-    if not any(p.devId == 1 for p in positions):
-        ship1 = db.query(DBShip).filter(DBShip.id == 1).first()
+    # Otherwise, Ship 1's position was already calculated in the pass above
+    if not fleet["has_ship1"]:
+        ship1 = db.query(DBShip.latitude, DBShip.longitude).filter(DBShip.id == 1).first()
         if ship1:
-            positions.insert(0, ShipRealtimeLocation(
-                logDateTime=current_time.isoformat(),
-                devId=1,
-                rcvDateTime=current_time.isoformat(),
-                lati=ship1.latitude,
-                longi=ship1.longitude,
-                azimuth=0.0,
-                course=0.0,
-                speed=0.0
-            ))
-
-    conn.close()
-    return positions
+            positions.insert(0, {
+                "logDateTime": current_iso,
+                "devId": 1,
+                "rcvDateTime": current_iso,
+                "lati": ship1.latitude,
+                "longi": ship1.longitude,
+                "azimuth": 0.0,
+                "course": 0.0,
+                "speed": 0.0
+            })
+
+    return ORJSONResponse(content=positions)
 
 @app.get("/api/simulation/routes")
-async def get_simulation_routes():
+async def get_simulation_routes(db: Session = Depends(get_db)):
     """Get all simulation routes"""
-    conn = sqlite3.connect('ship_routes.db')
-    cursor = conn.cursor()
+    return ORJSONResponse(content=[entry["route"] for entry in load_simulation_routes(db)])
 
-    cursor.execute("""
-        SELECT ship_id, ship_name, departure_time, arrival_time,
-               path, speed_knots, direction, total_distance_nm
-        FROM ship_routes_simulation
-        ORDER BY departure_time
-    """)
-
-    routes = cursor.fetchall()
-    result = []
-
-    for route in routes:
-        ship_id, ship_name, departure, arrival, path_json, speed, direction, distance = route
-        result.append({
-            "ship_id": ship_id,
-            "ship_name": ship_name,
-            "departure_time": departure,
-            "arrival_time": arrival,
-            "path": json.loads(path_json),
-            "speed_knots": speed,
-            "direction": direction,
-            "total_distance_nm": distance
-        })
+def build_ship_schedule(entry: dict) -> dict:
+    """Schedule card for one cached simulation route"""
+    route = entry["route"]
+    ship_name, path = route["ship_name"], route["path"]
+    is_fishing = "어선" in ship_name
 
-    conn.close()
-    return result
+    # Determine trip type based on direction
+    # to_fishing = departure (dock -> fishing area)
+    # to_docking = arrival (fishing area -> dock)
+    is_departure = route["direction"] == 'to_fishing'
 
-@app.get("/api/simulation/schedules")
-async def get_ship_schedules():
-    """Get all ship schedules from database"""
-    conn = sqlite3.connect('ship_routes.db')
-    cursor = conn.cursor()
+    # Get locations from path
+    start_location = path[0] if path else [35.98, 129.56]
+    end_location = path[-1] if path else [35.99, 129.57]
+    docking, fishing = (start_location, end_location) if is_departure else (end_location, start_location)
+
+    return {
+        "shipId": route["ship_id"],
+        "name": ship_name,
+        "type": "어선" if is_fishing else "화물선",
+        # Times from the seconds of day precomputed by the route cache
+        "departureTime": clock_hhmm(entry["departure_seconds"]),
+        "arrivalTime": clock_hhmm(entry["arrival_seconds"]) if route["arrival_time"] else None,
+        "tripType": 'departure' if is_departure else 'arrival',
+        "dockingLocation": {"lat": docking[0], "lng": docking[1]},
+        "fishingLocation": {"lat": fishing[0], "lng": fishing[1]} if is_fishing else None,
+        "speed": route["speed_knots"],  # Add speed in knots
+        "status": "scheduled"  # We can enhance this based on current simulation time
+    }
 
-    cursor.execute("""
-        SELECT ship_id, ship_name, departure_time, arrival_time,
-               path, speed_knots, direction, total_distance_nm
-        FROM ship_routes_simulation
-        ORDER BY departure_time
-    """)
-
-    schedules = []
-    for row in cursor.fetchall():
-        ship_id, ship_name, departure_time, arrival_time, path_json, speed, direction, distance = row
-        path = json.loads(path_json)
-
-        # Determine trip type based on direction
-        # to_fishing = departure (dock -> fishing area)
-        # to_docking = arrival (fishing area -> dock)
-        trip_type = 'departure' if direction == 'to_fishing' else 'arrival'
-
-        # Extract times
-        dep_time = datetime.fromisoformat(departure_time).strftime("%H:%M")
-        arr_time = datetime.fromisoformat(arrival_time).strftime("%H:%M")
-
-        # Get locations from path
-        start_location = path[0] if path else [35.98, 129.56]
-        end_location = path[-1] if path else [35.99, 129.57]
-
-        schedules.append({
-            "shipId": ship_id,
-            "name": ship_name,
-            "type": "어선" if "어선" in ship_name else "화물선",
-            "departureTime": dep_time,
-            "arrivalTime": arr_time,
-            "tripType": trip_type,
-            "dockingLocation": {
-                "lat": start_location[0] if trip_type == 'departure' else end_location[0],
-                "lng": start_location[1] if trip_type == 'departure' else end_location[1]
-            },
-            "fishingLocation": {
-                "lat": end_location[0] if trip_type == 'departure' else start_location[0],
-                "lng": end_location[1] if trip_type == 'departure' else start_location[1]
-            } if "어선" in ship_name else None,
-            "speed": speed,  # Add speed in knots
-            "status": "scheduled"  # We can enhance this based on current simulation time
-        })
 
-    conn.close()
-    return schedules
+@app.get("/api/simulation/schedules")
+async def get_ship_schedules(db: Session = Depends(get_db)):
+    """Get all ship schedules from database"""
+    routes = load_simulation_routes(db)
+    # Schedules only depend on the routes, so build them once per route cache rebuild
+    if simulation_routes_cache["schedules"] is None:
+        simulation_routes_cache["schedules"] = [build_ship_schedule(entry) for entry in routes]
+    return ORJSONResponse(content=simulation_routes_cache["schedules"])
 
 @app.get("/api/simulation/ship-route/{ship_id}")
-async def get_ship_simulation_route(ship_id: str):
+async def get_ship_simulation_route(ship_id: str, db: Session = Depends(get_db)):
     """Get simulation route for a specific ship"""
-    conn = sqlite3.connect('ship_routes.db')
-    cursor = conn.cursor()
-
-    # Map SHIP ID to EUM ID
-    id_mapping = {
-        'SHIP001': 'EUM001', 'SHIP002': 'EUM002', 'SHIP003': 'EUM003',
-        'SHIP004': 'EUM004', 'SHIP005': 'EUM005', 'SHIP006': 'EUM006',
-        'SHIP007': 'EUM007', 'SHIP008': 'EUM008', 'SHIP009': 'EUM009',
-        'SHIP010': 'EUM010'
-    }
-
     # Convert SHIP ID to EUM ID if needed
-    query_id = id_mapping.get(ship_id, ship_id)
-
-    # Try to find route for this ship
-    cursor.execute("""
-        SELECT ship_id, ship_name, departure_time, arrival_time,
-               path, speed_knots, direction, total_distance_nm
-        FROM ship_routes_simulation
-        WHERE ship_id = ?
-        ORDER BY departure_time DESC
-        LIMIT 1
-    """, (query_id,))
+    query_id = SHIP_TO_EUM_ID.get(ship_id, ship_id)
 
-    route = cursor.fetchone()
-    conn.close()
+    # Latest-departing route for this ship
+    load_simulation_routes(db)
+    route = simulation_routes_cache["by_ship"].get(query_id)
 
     if not route:
         return None
 
-    ship_id_db, ship_name, departure, arrival, path_json, speed, direction, distance = route
-    return {
-        "ship_id": ship_id,
-        "ship_name": ship_name,
-        "departure_time": departure,
-        "arrival_time": arrival,
-        "path": json.loads(path_json),
-        "speed_knots": speed,
-        "direction": direction,
-        "total_distance_nm": distance
-    }
+    return ORJSONResponse(content={**route, "ship_id": ship_id})
 
 @app.post("/api/simulation/generate-routes")
 async def generate_simulation_routes():
     """Generate new routes for simulation"""
-    import subprocess
-    result = subprocess.run(['python', 'generate_ship_routes.py'], capture_output=True, text=True)
+    # Run the generator in-process (off the event loop) instead of spawning an interpreter
+    try:
+        from generate_ship_routes import main as generate_routes_main
+        await asyncio.to_thread(generate_routes_main)
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+    finally:
+        invalidate_simulation_caches()
 
-    if result.returncode == 0:
-        return {"status": "success", "message": "Routes generated successfully"}
-    else:
-        return {"status": "error", "message": result.stderr}
+    return {"status": "success", "message": "Routes generated successfully"}
 
 
 @app.get("/api/daily-report")
@@ -2693,8 +2574,6 @@ async def get_daily_report(
     db: Session = Depends(get_db)
 ):
     """Generate daily operational report"""
-    from datetime import datetime, timedelta
-    from sqlalchemy import and_, func
 
     # Parse date or use today
     if date:
@@ -2705,13 +2584,18 @@ async def get_daily_report(
     start_datetime = datetime.combine(report_date, datetime.min.time())
     end_datetime = datetime.combine(report_date, datetime.max.time())
 
-    # Get ship statistics
-    total_ships = db.query(DBShip).count()
-    active_ships = db.query(DBShip).filter(DBShip.status.in_(['active', 'sailing'])).count()
-    docked_ships = db.query(DBShip).filter(DBShip.status == 'docked').count()
-
-    # Get SOS alerts for the day
-    sos_alerts = db.query(DBSOSAlert).filter(
+    # Get ship statistics in one pass; ships carry no status column, so a ship
+    # under way (speed > 0) counts as active and a stationary one as docked
+    total_ships, active_ships = db.query(
+        func.count(DBShip.id),
+        func.coalesce(func.sum(case((DBShip.speed > 0, 1), else_=0)), 0)
+    ).one()
+    docked_ships = total_ships - active_ships
+
+    # Get SOS alerts for the day (only the columns the report shows)
+    sos_alerts = db.query(
+        DBSOSAlert.created_at, DBSOSAlert.ship_name, DBSOSAlert.message, DBSOSAlert.status
+    ).filter(
         and_(
             DBSOSAlert.created_at >= start_datetime,
             DBSOSAlert.created_at <= end_datetime
@@ -2719,39 +2603,32 @@ async def get_daily_report(
     ).all()
 
     total_sos = len(sos_alerts)
-    active_sos = len([s for s in sos_alerts if s.status == 'active'])
-    resolved_sos = len([s for s in sos_alerts if s.status == 'resolved'])
-
-    # Get messages for the day
-    messages = db.query(DBMessage).filter(
+    active_sos = sum(1 for s in sos_alerts if s.status == 'active')
+    resolved_sos = sum(1 for s in sos_alerts if s.status == 'resolved')
+
+    # Count messages for the day without loading them
+    total_messages, sent_messages, received_messages = db.query(
+        func.count(DBMessage.id),
+        func.coalesce(func.sum(case((DBMessage.sender_id == 'control_center', 1), else_=0)), 0),
+        func.coalesce(func.sum(case((DBMessage.recipient_id == 'control_center', 1), else_=0)), 0)
+    ).filter(
         and_(
             DBMessage.created_at >= start_datetime,
             DBMessage.created_at <= end_datetime
         )
-    ).all()
+    ).one()
 
-    total_messages = len(messages)
-    sent_messages = len([m for m in messages if m.sender_id == 'control_center'])
-    received_messages = len([m for m in messages if m.recipient_id == 'control_center'])
-
-    # Get scheduled departures from simulation routes
-    conn = sqlite3.connect('ship_routes.db')
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT ship_id, ship_name, departure_time, arrival_time, direction
-        FROM ship_routes_simulation
-        ORDER BY departure_time
-    """)
-    departures = []
-    for row in cursor.fetchall():
-        departures.append({
-            "ship_id": row[0],
-            "ship_name": row[1],
-            "departure_time": row[2],
-            "arrival_time": row[3],
-            "direction": row[4]
-        })
-    conn.close()
+    # Get scheduled departures from the cached simulation routes (ordered by departure)
+    departures = [
+        {
+            "ship_id": route["ship_id"],
+            "ship_name": route["ship_name"],
+            "departure_time": route["departure_time"],
+            "arrival_time": route["arrival_time"],
+            "direction": route["direction"]
+        }
+        for route in (entry["route"] for entry in load_simulation_routes(db)[:10])
+    ]
 
     # Get any incidents (SOS alerts with descriptions)
     incidents = []
@@ -2759,7 +2636,7 @@ async def get_daily_report(
         incidents.append({
             "time": alert.created_at.strftime("%H:%M"),
             "ship_name": alert.ship_name,
-            "description": alert.description or "SOS Alert",
+            "description": alert.message or "SOS Alert",
             "status": alert.status
         })
 
@@ -2781,7 +2658,7 @@ async def get_daily_report(
             "sent_messages": sent_messages,
             "received_messages": received_messages
         },
-        "departures": departures[:10],  # Limit to 10 for display
+        "departures": departures,  # Limited to 10 for display
         "incidents": incidents
     }
 
@@ -5,14 +5,17 @@ Using Lat/Lng coordinates directly (no pixel conversion)
 
 import numpy as np
 import heapq
+import orjson
+import shapely
 from typing import List, Tuple, Optional, Set, Dict
 from datetime import datetime, timedelta
 import math
 from shapely.geometry import Point, Polygon, LineString
+from shapely.strtree import STRtree
 from shapely.ops import nearest_points
 import logging
-from dataclasses import dataclass
-import math
+from dataclasses import dataclass, field
+from math import sin, cos, asin, sqrt
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -21,6 +24,8 @@ logger = logging.getLogger(__name__)
 # Constants for navigation
 EARTH_RADIUS_KM = 6371.0  # Earth's radius in kilometers
 KM_TO_NM = 0.539957  # Conversion factor from km to nautical miles
+EARTH_RADIUS_NM = EARTH_RADIUS_KM * KM_TO_NM
+DEG_TO_RAD = math.pi / 180.0
 
 # Ship speed constants (in knots)
 DEFAULT_SHIP_SPEED = 10.0  # Default speed if not specified
@@ -40,18 +45,43 @@ def haversine_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> fl
     Calculate the great circle distance between two points on Earth.
     Returns distance in nautical miles.
     """
-    # Convert to radians
-    lat1, lng1, lat2, lng2 = map(math.radians, [lat1, lng1, lat2, lng2])
+    # Plain scalar math: no list/map allocation per call (hot in A*)
+    lat1 = lat1 * DEG_TO_RAD
+    lat2 = lat2 * DEG_TO_RAD
+    sin_dlat = sin((lat2 - lat1) * 0.5)
+    sin_dlng = sin((lng2 - lng1) * (DEG_TO_RAD * 0.5))
+    a = sin_dlat * sin_dlat + cos(lat1) * cos(lat2) * sin_dlng * sin_dlng
+
+    return EARTH_RADIUS_NM * 2.0 * asin(sqrt(a))
+
+def haversine_distances(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """
+    Vectorized haversine over arrays of coordinates.
+    Returns distances in nautical miles.
+    """
+    lat1, lng1, lat2, lng2 = (np.deg2rad(np.asarray(v, dtype=np.float64))
+                              for v in (lat1, lng1, lat2, lng2))
 
-    # Haversine formula
     dlat = lat2 - lat1
     dlng = lng2 - lng1
-    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlng/2)**2
-    c = 2 * math.asin(math.sqrt(a))
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
 
-    # Distance in km, then convert to nautical miles
-    distance_km = EARTH_RADIUS_KM * c
-    return distance_km * KM_TO_NM
+    return 2 * EARTH_RADIUS_NM * np.arcsin(np.sqrt(a))
+
+def path_segment_distances(path) -> np.ndarray:
+    """
+    Distances (nautical miles) of each consecutive segment of a (lat, lng) path.
+    """
+    arr = np.asarray(path, dtype=np.float64).reshape(-1, 2)
+    if len(arr) < 2:
+        return np.zeros(0)
+    return haversine_distances(arr[:-1, 0], arr[:-1, 1], arr[1:, 0], arr[1:, 1])
+
+def path_distance_nm(path) -> float:
+    """
+    Total length (nautical miles) of a (lat, lng) path.
+    """
+    return float(path_segment_distances(path).sum())
 
 def calculate_bearing(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
     """
@@ -81,9 +111,11 @@ def interpolate_position(lat1: float, lng1: float, lat2: float, lng2: float, fra
 
 class Node:
     """Node for A* pathfinding using lat/lng coordinates"""
-    def __init__(self, lat: float, lng: float, g: float = 0, h: float = 0, parent=None):
+    def __init__(self, lat: float, lng: float, g: float = 0, h: float = 0, parent=None,
+                 key: Tuple[int, int] = (0, 0)):
         self.lat = lat
         self.lng = lng
+        self.key = key  # Integer grid offset from the search start
         self.g = g  # Cost from start
         self.h = h  # Heuristic cost to goal
         self.f = g + h  # Total cost
@@ -118,6 +150,13 @@ class ShipRoute:
     color: str = 'blue'
     path_length_nm: float = 0
     timestamps: List[datetime] = None
+    # Contiguous (N, 2) lat/lng waypoints and seconds from departure at each waypoint
+    path_arr: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    time_offsets: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    # (min_lat, min_lng, max_lat, max_lng) of the waypoints
+    bbox: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    # JSON array of the waypoints, built on first use
+    _path_json: Optional[str] = field(default=None, repr=False, compare=False)
 
     def calculate_timestamps(self):
         """Calculate arrival time at each waypoint"""
@@ -127,27 +166,41 @@ class ShipRoute:
         # Ensure departure_time is a datetime object
         if isinstance(self.departure_time, (int, float)):
             # Convert minutes to datetime
-            import datetime as dt
-            self.departure_time = dt.datetime.now() + dt.timedelta(minutes=self.departure_time)
-
-        self.timestamps = [self.departure_time]
-        cumulative_time = self.departure_time
-        self.path_length_nm = 0
-
-        for i in range(len(self.path) - 1):
-            lat1, lng1 = self.path[i]
-            lat2, lng2 = self.path[i + 1]
-
-            # Calculate distance between waypoints
-            distance_nm = haversine_distance(lat1, lng1, lat2, lng2)
-            self.path_length_nm += distance_nm
-
-            # Calculate travel time (distance / speed)
-            # Handle zero speed by using default speed
-            speed = self.speed_knots if self.speed_knots > 0 else 10.0  # Default to 10 knots if speed is 0
-            travel_hours = distance_nm / speed
-            cumulative_time += timedelta(hours=travel_hours)
-            self.timestamps.append(cumulative_time)
+            self.departure_time = datetime.now() + timedelta(minutes=self.departure_time)
+
+        self.path_arr = np.asarray(self.path, dtype=np.float64).reshape(-1, 2)
+        self._path_json = None
+        self.bbox = np.concatenate((self.path_arr.min(axis=0), self.path_arr.max(axis=0)))
+        distances_nm = path_segment_distances(self.path_arr)
+        self.path_length_nm = float(distances_nm.sum())
+
+        # Calculate travel time (distance / speed)
+        # Handle zero speed by using default speed
+        speed = self.speed_knots if self.speed_knots > 0 else 10.0  # Default to 10 knots if speed is 0
+        self.time_offsets = np.concatenate(([0.0], np.cumsum(distances_nm / speed * 3600.0)))
+
+        self.timestamps = [self.departure_time + timedelta(seconds=offset)
+                           for offset in self.time_offsets.tolist()]
+
+    def shift_departure(self, departure_time):
+        """Move the route to a new departure time (datetime or minutes from now), keeping the path"""
+        if isinstance(departure_time, (int, float)):
+            departure_time = datetime.now() + timedelta(minutes=departure_time)
+        self.departure_time = departure_time
+        if self.time_offsets is not None:
+            self.timestamps = [departure_time + timedelta(seconds=offset)
+                               for offset in self.time_offsets.tolist()]
+
+    def positions_after_departure(self, elapsed_seconds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Interpolated (lats, lngs) at seconds after departure; the ship stays at its goal after arrival"""
+        return (np.interp(elapsed_seconds, self.time_offsets, self.path_arr[:, 0]),
+                np.interp(elapsed_seconds, self.time_offsets, self.path_arr[:, 1]))
+
+    def path_json(self) -> str:
+        """Waypoints as a JSON array string, serialized once per path"""
+        if self._path_json is None:
+            self._path_json = orjson.dumps(self.path).decode()
+        return self._path_json
 
     def get_position_at_time(self, query_time: datetime) -> Optional[Tuple[float, float]]:
         """Get ship position at a specific time"""
@@ -156,28 +209,26 @@ class ShipRoute:
 
         # Check if route is complete
         if query_time >= self.timestamps[-1]:
-            return self.path[-1]
+            lat, lng = self.path_arr[-1]
+            return (float(lat), float(lng))
 
         # Find which segment the ship is on
-        for i in range(len(self.timestamps) - 1):
-            if self.timestamps[i] <= query_time < self.timestamps[i + 1]:
-                # Interpolate position on this segment
-                segment_start = self.timestamps[i]
-                segment_end = self.timestamps[i + 1]
-                segment_duration = (segment_end - segment_start).total_seconds()
-
-                if segment_duration == 0:
-                    return self.path[i]
+        elapsed = (query_time - self.departure_time).total_seconds()
+        i = int(np.searchsorted(self.time_offsets, elapsed, side='right')) - 1
+        i = min(max(i, 0), len(self.time_offsets) - 2)
 
-                elapsed = (query_time - segment_start).total_seconds()
-                fraction = elapsed / segment_duration
+        # Interpolate position on this segment
+        segment_duration = self.time_offsets[i + 1] - self.time_offsets[i]
+        if segment_duration == 0:
+            lat, lng = self.path_arr[i]
+            return (float(lat), float(lng))
 
-                lat1, lng1 = self.path[i]
-                lat2, lng2 = self.path[i + 1]
+        fraction = (elapsed - self.time_offsets[i]) / segment_duration
 
-                return interpolate_position(lat1, lng1, lat2, lng2, fraction)
+        lat1, lng1 = self.path_arr[i]
+        lat2, lng2 = self.path_arr[i + 1]
 
-        return self.path[-1]
+        return interpolate_position(float(lat1), float(lng1), float(lat2), float(lng2), float(fraction))
 
 class ObstaclePolygon:
     """Represents an obstacle area defined by lat/lng vertices"""
@@ -200,6 +251,10 @@ class ObstaclePolygon:
         margin_degrees = OBSTACLE_MARGIN_NM / avg_nm_per_degree if OBSTACLE_MARGIN_NM > 0 else 0
         self.buffered_polygon = self.polygon.buffer(margin_degrees) if margin_degrees > 0 else self.polygon
 
+        # Prepare geometries so repeated contains/intersects queries are fast
+        shapely.prepare(self.polygon)
+        shapely.prepare(self.buffered_polygon)
+
     def contains_point(self, lat: float, lng: float) -> bool:
         """Check if a point is inside the obstacle (with small buffer)"""
         point = Point(lng, lat)
@@ -221,35 +276,93 @@ class ObstaclePolygon:
         nearest = nearest_points(self.buffered_polygon, point)[0]
         return point.distance(nearest)
 
+def build_obstacle_index(obstacles: List[ObstaclePolygon]) -> STRtree:
+    """Build a spatial index over the buffered obstacle polygons"""
+    return STRtree([obstacle.buffered_polygon for obstacle in obstacles])
+
+def build_obstacle_bboxes(obstacles: List[ObstaclePolygon]) -> np.ndarray:
+    """Pack buffered obstacle bounds into an (N, 4) array of (min_lat, min_lng, max_lat, max_lng)"""
+    bboxes = np.empty((len(obstacles), 4), dtype=np.float64)
+    for i, obstacle in enumerate(obstacles):
+        min_lng, min_lat, max_lng, max_lat = obstacle.buffered_polygon.bounds
+        bboxes[i] = (min_lat, min_lng, max_lat, max_lng)
+    return bboxes
+
 class CollisionChecker:
     """Check for collisions with obstacles and other ships"""
-    def __init__(self, obstacles: List[ObstaclePolygon]):
+    def __init__(self, obstacles: List[ObstaclePolygon],
+                 obstacle_index: Optional[STRtree] = None):
         self.obstacles = obstacles
+        # Spatial index for candidate filtering before exact shapely checks
+        self.obstacle_index = obstacle_index if obstacle_index is not None else build_obstacle_index(obstacles)
+        self.obstacle_bboxes = build_obstacle_bboxes(obstacles)
         self.existing_routes: List[ShipRoute] = []
+        # FleetExtents of existing_routes, built on first use after a change
+        self.route_extents: Optional['FleetExtents'] = None
 
     def add_route(self, route: ShipRoute):
         """Add an existing route to check against"""
         self.existing_routes.append(route)
+        self.route_extents = None
+
+    def routes_near(self, path: List[Tuple[float, float]]) -> List[ShipRoute]:
+        """Existing routes whose bounding box comes within collision range of the path's"""
+        if self.route_extents is None:
+            self.route_extents = FleetExtents.from_ships(self.existing_routes)
+        return ships_near_path(path, self.existing_routes, extents=self.route_extents)
+
+    def points_safe(self, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+        """
+        Vectorized obstacle check (with small buffer) for a batch of points.
+        Bounding boxes prune candidates in one pass; only overlapping obstacles
+        get an exact shapely test.
+        """
+        bb = self.obstacle_bboxes
+        lat_col = lats[:, None]
+        lng_col = lngs[:, None]
+        near = (bb[:, 0] <= lat_col) & (lat_col <= bb[:, 2]) & \
+               (bb[:, 1] <= lng_col) & (lng_col <= bb[:, 3])
+
+        safe = np.ones(len(lats), dtype=bool)
+        for j in np.flatnonzero(near.any(axis=0)):
+            idx = np.flatnonzero(near[:, j] & safe)
+            if len(idx):
+                inside = shapely.contains_xy(self.obstacles[j].buffered_polygon, lngs[idx], lats[idx])
+                safe[idx[inside]] = False
+        return safe
+
+    def line_intersects_obstacle(self, lat1: float, lng1: float, lat2: float, lng2: float) -> bool:
+        """Check if a line segment intersects any obstacle (with small buffer)"""
+        line = LineString([(lng1, lat1), (lng2, lat2)])
+        for i in self.obstacle_index.query(line):
+            if self.obstacles[i].buffered_polygon.intersects(line):
+                return True
+        return False
 
     def is_position_safe(self, lat: float, lng: float,
                          check_time: Optional[datetime] = None,
-                         ignore_buffer: bool = False) -> bool:
-        """Check if a position is safe (not in obstacle or too close to other ships)"""
-        # Check obstacles
-        for obstacle in self.obstacles:
+                         ignore_buffer: bool = False,
+                         routes: Optional[List[ShipRoute]] = None) -> bool:
+        """
+        Check if a position is safe (not in obstacle or too close to other ships).
+        routes narrows the ships checked at check_time (default: all existing routes).
+        """
+        # Check obstacles whose bounding box covers the point
+        point = Point(lng, lat)
+        for i in self.obstacle_index.query(point):
+            obstacle = self.obstacles[i]
             if ignore_buffer:
                 # Check only the actual obstacle, not the buffered version
-                point = Point(lng, lat)
                 if obstacle.polygon.contains(point):
                     return False
             else:
                 # Check with buffer
-                if obstacle.contains_point(lat, lng):
+                if obstacle.buffered_polygon.contains(point):
                     return False
 
         # Check other ships if time is specified
         if check_time:
-            for route in self.existing_routes:
+            for route in (self.existing_routes if routes is None else routes):
                 other_pos = route.get_position_at_time(check_time)
                 if other_pos:
                     distance = haversine_distance(lat, lng, other_pos[0], other_pos[1])
@@ -260,12 +373,12 @@ class CollisionChecker:
 
     def is_path_safe(self, lat1: float, lng1: float, lat2: float, lng2: float,
                      start_time: Optional[datetime] = None,
-                     travel_time_hours: Optional[float] = None) -> bool:
-        """Check if a path segment is safe"""
+                     travel_time_hours: Optional[float] = None,
+                     routes: Optional[List[ShipRoute]] = None) -> bool:
+        """Check if a path segment is safe (routes as in is_position_safe)"""
         # Check obstacle intersection
-        for obstacle in self.obstacles:
-            if obstacle.intersects_line(lat1, lng1, lat2, lng2):
-                return False
+        if self.line_intersects_obstacle(lat1, lng1, lat2, lng2):
+            return False
 
         # Check collision with other ships along the path
         if start_time and travel_time_hours:
@@ -276,11 +389,67 @@ class CollisionChecker:
                 check_lat, check_lng = interpolate_position(lat1, lng1, lat2, lng2, fraction)
                 check_time = start_time + timedelta(hours=travel_time_hours * fraction)
 
-                if not self.is_position_safe(check_lat, check_lng, check_time):
+                if not self.is_position_safe(check_lat, check_lng, check_time, routes=routes):
                     return False
 
         return True
 
+EXTENT_EPOCH = datetime(2000, 1, 1)
+
+
+def seconds_since_epoch(dt: datetime) -> float:
+    """Naive datetime as seconds since EXTENT_EPOCH (no timezone conversion)"""
+    return (dt - EXTENT_EPOCH).total_seconds()
+
+
+@dataclass
+class FleetExtents:
+    """Stacked bounding boxes and sailing intervals of timestamped ship routes"""
+    ships: List[ShipRoute]
+    bboxes: np.ndarray  # (K, 4) min_lat, min_lng, max_lat, max_lng
+    spans: np.ndarray  # (K, 2) departure, arrival as seconds_since_epoch
+
+    @classmethod
+    def from_ships(cls, ships: List[ShipRoute]) -> 'FleetExtents':
+        ships = [ship for ship in ships if ship.bbox is not None]
+        bboxes = np.array([ship.bbox for ship in ships]).reshape(-1, 4)
+        spans = np.array([(seconds_since_epoch(ship.timestamps[0]), seconds_since_epoch(ship.timestamps[-1]))
+                          for ship in ships]).reshape(-1, 2)
+        return cls(ships, bboxes, spans)
+
+
+def ships_near_path(path, ships: List[ShipRoute],
+                    margin_nm: float = COLLISION_RADIUS_NM,
+                    time_window: Optional[Tuple[datetime, datetime]] = None,
+                    extents: Optional[FleetExtents] = None) -> List[ShipRoute]:
+    """
+    Ships whose route bounding box comes within margin_nm of the path's bounding box
+    (and, if time_window is given, whose sailing interval overlaps it).
+    Ships outside that corridor can never get close enough to conflict.
+    extents may be passed in when it was already built for the same ships.
+    """
+    if extents is None:
+        extents = FleetExtents.from_ships(ships)
+    if not extents.ships:
+        return []
+
+    path_arr = np.asarray(path, dtype=np.float64).reshape(-1, 2)
+    lat_margin = margin_nm / 60.0
+    lng_margin = margin_nm / (60.0 * math.cos(math.radians(path_arr[:, 0].mean())))
+    margin = np.array([lat_margin, lng_margin])
+    path_min = path_arr.min(axis=0) - margin
+    path_max = path_arr.max(axis=0) + margin
+
+    bboxes = extents.bboxes
+    mask = ((bboxes[:, 0] <= path_max[0]) & (bboxes[:, 1] <= path_max[1]) &
+            (bboxes[:, 2] >= path_min[0]) & (bboxes[:, 3] >= path_min[1]))
+    if time_window is not None:
+        window_start, window_end = time_window
+        mask &= ((extents.spans[:, 0] <= seconds_since_epoch(window_end)) &
+                 (extents.spans[:, 1] >= seconds_since_epoch(window_start)))
+
+    return [extents.ships[i] for i in np.flatnonzero(mask).tolist()]
+
 class PathAdjuster:
     """Adjust departure times to avoid collisions"""
     def __init__(self, collision_checker: CollisionChecker):
@@ -291,55 +460,35 @@ class PathAdjuster:
                                  speed: float = DEFAULT_SHIP_SPEED,
                                  max_delay_hours: float = 24) -> Optional[datetime]:
         """Find a safe departure time near the preferred time"""
-        # Try the preferred time first
+        # Segment travel hours only depend on the path, so every candidate time shares them
+        segments = list(zip(path[:-1], path[1:], (path_segment_distances(path) / speed).tolist()))
+
+        # Ships whose route never comes near this path cannot conflict at any departure time
+        nearby_routes = self.collision_checker.routes_near(path)
+
+        # One test route, re-timed per candidate instead of rebuilt
         test_route = ShipRoute("test", "test", path[0], path[-1], path,
                               preferred_time, speed)
         test_route.calculate_timestamps()
 
-        # Check if the route is safe at preferred time
-        is_safe = True
-        for i in range(len(path) - 1):
-            lat1, lng1 = path[i]
-            lat2, lng2 = path[i + 1]
-
-            distance_nm = haversine_distance(lat1, lng1, lat2, lng2)
-            travel_hours = distance_nm / speed
-
-            segment_start = test_route.timestamps[i]
-
-            if not self.collision_checker.is_path_safe(lat1, lng1, lat2, lng2,
-                                                       segment_start, travel_hours):
-                is_safe = False
-                break
+        def is_safe_at(departure_time: datetime) -> bool:
+            test_route.shift_departure(departure_time)
+            return all(
+                self.collision_checker.is_path_safe(lat1, lng1, lat2, lng2, segment_start, travel_hours,
+                                                    routes=nearby_routes)
+                for ((lat1, lng1), (lat2, lng2), travel_hours), segment_start
+                in zip(segments, test_route.timestamps)
+            )
 
-        if is_safe:
+        # Try the preferred time first
+        if is_safe_at(preferred_time):
             return preferred_time
 
         # Try alternative times
         for delay_hours in np.arange(0.5, max_delay_hours, 0.5):
             for direction in [1, -1]:  # Try both later and earlier
                 test_time = preferred_time + timedelta(hours=delay_hours * direction)
-
-                test_route = ShipRoute("test", "test", path[0], path[-1], path,
-                                     test_time, speed)
-                test_route.calculate_timestamps()
-
-                is_safe = True
-                for i in range(len(path) - 1):
-                    lat1, lng1 = path[i]
-                    lat2, lng2 = path[i + 1]
-
-                    distance_nm = haversine_distance(lat1, lng1, lat2, lng2)
-                    travel_hours = distance_nm / speed
-
-                    segment_start = test_route.timestamps[i]
-
-                    if not self.collision_checker.is_path_safe(lat1, lng1, lat2, lng2,
-                                                               segment_start, travel_hours):
-                        is_safe = False
-                        break
-
-                if is_safe:
+                if is_safe_at(test_time):
                     return test_time
 
         return None
@@ -347,77 +496,100 @@ class PathAdjuster:
 class RouteOptimizer:
     """Main route optimization using A* algorithm with lat/lng coordinates"""
     def __init__(self, obstacles: List[ObstaclePolygon],
-                 existing_routes: Optional[List[ShipRoute]] = None):
-        self.collision_checker = CollisionChecker(obstacles)
+                 existing_routes: Optional[List[ShipRoute]] = None,
+                 obstacle_index: Optional[STRtree] = None):
+        self.collision_checker = CollisionChecker(obstacles, obstacle_index)
         if existing_routes:
             for route in existing_routes:
                 self.collision_checker.add_route(route)
 
         self.path_adjuster = PathAdjuster(self.collision_checker)
+        # A* only avoids static obstacles, so a different departure time never changes the path
+        self.path_depends_on_time = False
+
+    def is_cell_safe(self, key: Tuple[int, int], lat: float, lng: float) -> bool:
+        """Obstacle check for a grid cell, memoized for the current search"""
+        safe = self._safe_cells.get(key)
+        if safe is None:
+            safe = self.collision_checker.is_position_safe(lat, lng)
+            self._safe_cells[key] = safe
+        return safe
 
     def get_neighbors(self, node: Node, goal_lat: float, goal_lng: float) -> List[Node]:
         """Get valid neighboring positions"""
         neighbors = []
 
-        # 8-directional movement with adaptive step size
-        base_step = GRID_RESOLUTION
-        distance_to_goal = haversine_distance(node.lat, node.lng, goal_lat, goal_lng)
+        # 8-directional movement with adaptive step size (in grid cells)
+        distance_to_goal = node.h
 
         # Use larger steps when far from goal, smaller steps when close
         if distance_to_goal > 5.0:  # More than 5 NM away
-            step = base_step * 5  # Reduced multiplier for better obstacle navigation
+            step = 5  # Reduced multiplier for better obstacle navigation
         elif distance_to_goal > 1.0:  # 1-5 NM away
-            step = base_step * 2  # Reduced multiplier
+            step = 2  # Reduced multiplier
         else:
-            step = base_step
+            step = 1
+
+        # Boundary check - don't go too far from start and goal
+        # This prevents the algorithm from exploring too far
+        min_lat, max_lat, min_lng, max_lng = self._search_bounds
+        ki, kj = node.key
 
         # 8 directions: N, NE, E, SE, S, SW, W, NW
-        directions = [
-            (step, 0),      # North
-            (step, step),   # Northeast
-            (0, step),      # East
-            (-step, step),  # Southeast
-            (-step, 0),     # South
-            (-step, -step), # Southwest
-            (0, -step),     # West
-            (step, -step)   # Northwest
-        ]
-
-        for dlat, dlng in directions:
-            new_lat = node.lat + dlat
-            new_lng = node.lng + dlng
-
-            # Boundary check - don't go too far from start and goal
-            # This prevents the algorithm from exploring too far
-            min_lat = min(self.start_lat, goal_lat) - 0.05  # About 3 NM buffer
-            max_lat = max(self.start_lat, goal_lat) + 0.05
-            min_lng = min(self.start_lng, goal_lng) - 0.05
-            max_lng = max(self.start_lng, goal_lng) + 0.05
+        candidates = []
+        for di, dj in ((step, 0), (step, step), (0, step), (-step, step),
+                       (-step, 0), (-step, -step), (0, -step), (step, -step)):
+            key = (ki + di, kj + dj)
+            # Step from the parent position (not start + key) so coordinates, and
+            # hence f-score ties, round exactly as they always have
+            new_lat = node.lat + di * GRID_RESOLUTION
+            new_lng = node.lng + dj * GRID_RESOLUTION
 
             if new_lat < min_lat or new_lat > max_lat or new_lng < min_lng or new_lng > max_lng:
                 continue
+            candidates.append((key, new_lat, new_lng))
+
+        # Obstacle-check all cells not seen yet in this search in one batch
+        unknown = [c for c in candidates if c[0] not in self._safe_cells]
+        if unknown:
+            safe = self.collision_checker.points_safe(
+                np.array([c[1] for c in unknown]), np.array([c[2] for c in unknown]))
+            for (key, _, _), is_safe in zip(unknown, safe.tolist()):
+                self._safe_cells[key] = is_safe
 
+        for key, new_lat, new_lng in candidates:
             # Check if position is safe
-            if self.collision_checker.is_position_safe(new_lat, new_lng):
+            if self.is_cell_safe(key, new_lat, new_lng):
                 # Calculate costs
                 move_distance = haversine_distance(node.lat, node.lng, new_lat, new_lng)
                 g = node.g + move_distance
                 h = haversine_distance(new_lat, new_lng, goal_lat, goal_lng)
 
-                neighbor = Node(new_lat, new_lng, g, h, node)
-                neighbors.append(neighbor)
+                neighbors.append(Node(new_lat, new_lng, g, h, node, key))
 
         return neighbors
 
     def find_path_astar(self, start_lat: float, start_lng: float,
                        goal_lat: float, goal_lng: float,
-                       departure_time: Optional[datetime] = None) -> Optional[List[Tuple[float, float]]]:
-        """Find optimal path using A* algorithm"""
+                       departure_time: Optional[datetime] = None,
+                       departure_time_minutes: Optional[float] = None) -> Optional[List[Tuple[float, float]]]:
+        """
+        Find optimal path using A* algorithm.
+        The search only avoids static obstacles, so the departure time (either a
+        datetime or minutes) does not affect the path and no datetime is needed.
+        """
         logger.info(f"Finding path from ({start_lat}, {start_lng}) to ({goal_lat}, {goal_lng})")
 
-        # Store start position for neighbor checks
+        # Store start position and search area for neighbor checks
         self.start_lat = start_lat
         self.start_lng = start_lng
+        self._search_bounds = (
+            min(start_lat, goal_lat) - 0.05,  # About 3 NM buffer
+            max(start_lat, goal_lat) + 0.05,
+            min(start_lng, goal_lng) - 0.05,
+            max(start_lng, goal_lng) + 0.05,
+        )
+        self._safe_cells: Dict[Tuple[int, int], bool] = {}
 
         # Check if start and goal are valid
         # Allow start/goal positions even if inside obstacles (harbors may be in restricted zones)
@@ -434,10 +606,11 @@ class RouteOptimizer:
         # Initialize A* algorithm
         start_node = Node(start_lat, start_lng, 0,
                          haversine_distance(start_lat, start_lng, goal_lat, goal_lng))
-        goal_node = Node(goal_lat, goal_lng)
 
-        open_set = []
-        heapq.heappush(open_set, start_node)
+        # Heap entries are (f, counter, node); stale entries are skipped on pop
+        counter = 0
+        open_set = [(start_node.f, counter, start_node)]
+        g_score = {start_node.key: 0.0}
         closed_set = set()
 
         # Limit iterations to prevent infinite loops
@@ -446,22 +619,22 @@ class RouteOptimizer:
 
         # Track best node found so far (closest to goal)
         best_node = start_node
-        best_distance = haversine_distance(start_lat, start_lng, goal_lat, goal_lng)
+        best_distance = start_node.h
+        goal_tolerance = GRID_RESOLUTION * 2
 
         while open_set and iteration < max_iterations:
-            iteration += 1
+            current = heapq.heappop(open_set)[2]
+            if current.key in closed_set:
+                continue
 
-            current = heapq.heappop(open_set)
+            iteration += 1
 
             # Track best node (closest to goal)
-            current_distance = haversine_distance(current.lat, current.lng, goal_lat, goal_lng)
-            if current_distance < best_distance:
+            if current.h < best_distance:
                 best_node = current
-                best_distance = current_distance
+                best_distance = current.h
 
             # Check if we reached the goal (within tolerance)
-            # Increased tolerance for better goal reaching
-            goal_tolerance = GRID_RESOLUTION * 2
             if abs(current.lat - goal_lat) < goal_tolerance and \
                abs(current.lng - goal_lng) < goal_tolerance:
                 # Reconstruct path
@@ -478,25 +651,19 @@ class RouteOptimizer:
                 logger.info(f"Path found with {len(simplified_path)} waypoints")
                 return simplified_path
 
-            closed_set.add(current)
+            closed_set.add(current.key)
 
             # Get neighbors
             for neighbor in self.get_neighbors(current, goal_lat, goal_lng):
-                if neighbor in closed_set:
+                if neighbor.key in closed_set:
                     continue
 
-                # Check if neighbor is already in open set with better cost
-                in_open = False
-                for i, node in enumerate(open_set):
-                    if node == neighbor:
-                        if node.g > neighbor.g:
-                            open_set[i] = neighbor
-                            heapq.heapify(open_set)
-                        in_open = True
-                        break
-
-                if not in_open:
-                    heapq.heappush(open_set, neighbor)
+                # Only queue the neighbor if it improves the known cost
+                known_g = g_score.get(neighbor.key)
+                if known_g is None or neighbor.g < known_g:
+                    g_score[neighbor.key] = neighbor.g
+                    counter += 1
+                    heapq.heappush(open_set, (neighbor.f, counter, neighbor))
 
             # Log progress periodically
             if iteration % 1000 == 0 and iteration > 0:
@@ -536,13 +703,7 @@ class RouteOptimizer:
                 lat2, lng2 = path[j]
 
                 # Check if direct path is safe (no obstacle intersection)
-                safe = True
-                for obstacle in self.collision_checker.obstacles:
-                    if obstacle.intersects_line(lat1, lng1, lat2, lng2):
-                        safe = False
-                        break
-
-                if safe:
+                if not self.collision_checker.line_intersects_obstacle(lat1, lng1, lat2, lng2):
                     best_j = j  # Can reach this point directly
                 else:
                     break  # Can't go further, use previous best
@@ -563,13 +724,7 @@ class RouteOptimizer:
         logger.info("Attempting direct path with obstacle avoidance")
 
         # Check if direct path is possible (no obstacles in the way)
-        direct_safe = True
-        for obstacle in self.collision_checker.obstacles:
-            if obstacle.intersects_line(start_lat, start_lng, goal_lat, goal_lng):
-                direct_safe = False
-                break
-
-        if direct_safe:
+        if not self.collision_checker.line_intersects_obstacle(start_lat, start_lng, goal_lat, goal_lng):
             return [(start_lat, start_lng), (goal_lat, goal_lng)]
 
         # Try multiple intermediate waypoints to navigate around obstacles
@@ -616,15 +771,10 @@ class RouteOptimizer:
             else:
                 # Waypoint is safe, but verify path from last point is also safe
                 last_point = waypoints[-1]
-                path_safe = True
 
                 # Check if the path segment intersects any obstacle
-                for obstacle in self.collision_checker.obstacles:
-                    if obstacle.intersects_line(last_point[0], last_point[1], waypoint_lat, waypoint_lng):
-                        path_safe = False
-                        break
-
-                if path_safe:
+                if not self.collision_checker.line_intersects_obstacle(last_point[0], last_point[1],
+                                                                       waypoint_lat, waypoint_lng):
                     waypoints.append((waypoint_lat, waypoint_lng))
                 else:
                     # Path is blocked, try to find alternative route around obstacle
@@ -634,12 +784,8 @@ class RouteOptimizer:
                         alt_lat = waypoint_lat + dlat
                         alt_lng = waypoint_lng + dlng
                         if self.collision_checker.is_position_safe(alt_lat, alt_lng):
-                            alt_safe = True
-                            for obstacle in self.collision_checker.obstacles:
-                                if obstacle.intersects_line(last_point[0], last_point[1], alt_lat, alt_lng):
-                                    alt_safe = False
-                                    break
-                            if alt_safe:
+                            if not self.collision_checker.line_intersects_obstacle(last_point[0], last_point[1],
+                                                                                   alt_lat, alt_lng):
                                 waypoints.append((alt_lat, alt_lng))
                                 break
 
@@ -708,7 +854,8 @@ class RouteOptimizer:
         }
 
     def optimize_departure_time(self, new_ship: ShipRoute, existing_ships: List[ShipRoute],
-                               time_window_minutes: int = 1440) -> float:
+                               time_window_minutes: int = 1440,
+                               existing_extents: Optional[FleetExtents] = None) -> float:
         """
         Find optimal departure time to avoid collisions with existing routes
 
@@ -716,13 +863,11 @@ class RouteOptimizer:
             new_ship: The ship route to optimize
             existing_ships: List of existing ship routes to avoid
             time_window_minutes: Time window to search for optimal departure (default 24 hours)
+            existing_extents: Prebuilt FleetExtents of existing_ships, if the caller keeps one
 
         Returns:
             Optimal departure time in minutes from now
         """
-        from datetime import datetime, timedelta
-        import math
-
         current_time = datetime.now()
 
         # Determine base requested departure as datetime
@@ -739,10 +884,42 @@ class RouteOptimizer:
         max_offset = min(10, time_window_minutes)
         step_minutes = 1
 
+        # Broad phase: only ships whose corridor and sailing window can meet some
+        # candidate departure need the pairwise position checks below
+        if new_ship.time_offsets is not None:
+            voyage = timedelta(seconds=float(new_ship.time_offsets[-1]))
+            existing_ships = ships_near_path(
+                new_ship.path, existing_ships, margin_nm=COLLISION_RADIUS_NM,
+                time_window=(base_departure_dt + timedelta(minutes=min_offset),
+                             base_departure_dt + timedelta(minutes=max_offset) + voyage),
+                extents=existing_extents
+            )
+
         best_time = base_departure_minutes  # default to requested time
         min_conflicts = float('inf')
         best_min_distance = 0
 
+        # Candidate copy of the ship; only its departure moves between candidates
+        test_ship = ShipRoute(
+            name=new_ship.name,
+            ship_id=new_ship.ship_id,
+            start=new_ship.start,
+            goal=new_ship.goal,
+            path=new_ship.path,
+            departure_time=base_departure_dt,
+            speed_knots=new_ship.speed_knots
+        )
+        test_ship.calculate_timestamps()
+
+        # Sample times (seconds after departure): both ends, then every 10 minutes.
+        # They do not depend on the candidate departure, so the new ship's own
+        # positions at those times are computed once
+        voyage_seconds = (test_ship.timestamps[-1] - test_ship.timestamps[0]).total_seconds()
+        check_offsets = np.array([0.0, voyage_seconds] +
+                                 [t * 60.0 for t in range(0, int(voyage_seconds / 60), 10)])
+        test_lats, test_lngs = test_ship.positions_after_departure(check_offsets)
+        safety_distance_nm = 0.5  # 500m safety buffer
+
         # Search only within [base+3, base+10] minutes by 1-minute steps
         for minutes_offset in range(min_offset, max_offset + 1, step_minutes):
             test_departure = base_departure_dt + timedelta(minutes=minutes_offset)
@@ -750,16 +927,7 @@ class RouteOptimizer:
             min_distance = float('inf')
 
             # Update ship's timestamps for this candidate departure time
-            test_ship = ShipRoute(
-                name=new_ship.name,
-                ship_id=new_ship.ship_id,
-                start=new_ship.start,
-                goal=new_ship.goal,
-                path=new_ship.path,
-                departure_time=test_departure,
-                speed_knots=new_ship.speed_knots
-            )
-            test_ship.calculate_timestamps()
+            test_ship.shift_departure(test_departure)
 
             # Check for conflicts with existing routes
             for existing_ship in existing_ships:
@@ -776,33 +944,18 @@ class RouteOptimizer:
                 if test_end < exist_start or test_start > exist_end:
                     continue
 
-                # Check minimum distance between ships at various time points
-                check_times = []
-
-                # Add critical time points
-                check_times.extend([test_start, test_end])
-
-                # Add intermediate time points
-                duration = (test_end - test_start).total_seconds() / 60  # minutes
-                for t in range(0, int(duration), 10):  # Check every 10 minutes
-                    check_times.append(test_start + timedelta(minutes=t))
-
-                for check_time in check_times:
-                    test_pos = test_ship.get_position_at_time(check_time)
-                    exist_pos = existing_ship.get_position_at_time(check_time)
-
-                    if test_pos and exist_pos:
-                        # Calculate distance between ships
-                        distance = haversine_distance(test_pos[0], test_pos[1],
-                                                     exist_pos[0], exist_pos[1])
-
-                        # Safety distance in nautical miles
-                        safety_distance_nm = 0.5  # 500m safety buffer
-
-                        if distance < safety_distance_nm:
-                            conflicts += 1
+                # Check minimum distance between ships at all sample times at once;
+                # samples before the existing ship departs are skipped
+                exist_elapsed = check_offsets + (test_start - existing_ship.departure_time).total_seconds()
+                sailing = exist_elapsed >= 0
+                if not sailing.any():
+                    continue
+                exist_lats, exist_lngs = existing_ship.positions_after_departure(exist_elapsed[sailing])
+                distances = haversine_distances(test_lats[sailing], test_lngs[sailing],
+                                                exist_lats, exist_lngs)
 
-                        min_distance = min(min_distance, distance)
+                conflicts += int(np.count_nonzero(distances < safety_distance_nm))
+                min_distance = min(min_distance, float(distances.min()))
 
             # Select time with minimum conflicts and maximum minimum distance
             if conflicts < min_conflicts or (conflicts == min_conflicts and min_distance > best_min_distance):
@@ -1,10 +1,11 @@
 """Database configuration and models"""
 
-from sqlalchemy import create_engine, Column, Integer, Float, String, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import create_engine, event, Column, Index, Integer, Float, String, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
-import json
+import orjson
 
 # SQLite database
 SQLALCHEMY_DATABASE_URL = "sqlite:///./ship_routes.db"
@@ -14,7 +15,26 @@ engine = create_engine(
     connect_args={"check_same_thread": False}
 )
 
+
+@event.listens_for(engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL lets readers proceed during writes; NORMAL sync is safe under WAL"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Same file over aiosqlite, for read endpoints that await their queries instead of blocking the event loop
+ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./ship_routes.db"
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL)
+event.listen(async_engine.sync_engine, "connect", set_sqlite_pragmas)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 
@@ -53,26 +73,33 @@ class ShipRoute(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # (path_points, decoded path) of the last get_path call on this instance
+    _path_cache = None
+
     def get_path(self):
-        """Get path as list of tuples"""
-        if self.path_points:
-            points = json.loads(self.path_points)
-            return [(p[0], p[1]) for p in points]
-        return []
+        """Get path as list of tuples, decoded once per stored value"""
+        if not self.path_points:
+            return []
+        if self._path_cache is None or self._path_cache[0] is not self.path_points:
+            points = orjson.loads(self.path_points)
+            self._path_cache = (self.path_points, [(p[0], p[1]) for p in points])
+        return list(self._path_cache[1])
 
     def set_path(self, path):
         """Set path from list of tuples"""
-        self.path_points = json.dumps([[p[0], p[1]] for p in path])
+        self.path_points = orjson.dumps([[p[0], p[1]] for p in path],
+                                       option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        self._path_cache = None
 
     def get_speeds(self):
         """Get segment speeds as list"""
         if self.path_speeds:
-            return json.loads(self.path_speeds)
+            return orjson.loads(self.path_speeds)
         return []
 
     def set_speeds(self, speeds):
         """Set segment speeds"""
-        self.path_speeds = json.dumps(speeds)
+        self.path_speeds = orjson.dumps(speeds, option=orjson.OPT_SERIALIZE_NUMPY).decode()
 
 
 class Ship(Base):
@@ -196,10 +223,21 @@ class Message(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     read_at = Column(DateTime)
 
+    # Newest-first lookups per sender/recipient (SQLite scans these backwards for DESC)
+    __table_args__ = (
+        Index('ix_messages_sender_created', 'sender_id', 'created_at'),
+        Index('ix_messages_recipient_created', 'recipient_id', 'created_at'),
+    )
+
 
 # Create tables
 Base.metadata.create_all(bind=engine)
 
+# create_all skips existing tables, so add indexes introduced after a table was created
+for table in Base.metadata.sorted_tables:
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
+
 
 def get_db():
     """Get database session"""
@@ -207,4 +245,10 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    """Get async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -26,6 +26,11 @@ class EUMAPIClient:
             'Accept': 'application/json',
             'Content-Type': 'application/json'
         }
+        # Reuse connections (keep-alive) across API calls
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        # SSL 검증 비활성화 (EUM API 서버 인증서 문제 우회)
+        self.session.verify = False
 
     def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
         """Make HTTP request to EUM API"""
@@ -37,8 +42,7 @@ class EUMAPIClient:
 
         try:
             logger.info(f"Making request to: {url}")
-            # SSL 검증 비활성화 (EUM API 서버 인증서 문제 우회)
-            response = requests.get(url, params=params, headers=self.headers, verify=False)
+            response = self.session.get(url, params=params)
             response.raise_for_status()
 
             data = response.json()
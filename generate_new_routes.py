@@ -2,7 +2,7 @@
 """Generate new routes for EUM002-EUM010 (keeping SHIP001 untouched)"""
 
 import sqlite3
-import json
+import orjson
 from datetime import datetime, timedelta
 from math import radians, sin, cos, sqrt, atan2
 
@@ -109,7 +109,7 @@ for ship_id, departure_minute in departure_schedule:
         ship['ship_name'],
         morning_departure.isoformat(),
         morning_arrival.isoformat(),
-        json.dumps(morning_path),
+        orjson.dumps(morning_path).decode(),
         10.0,
         'to_fishing',
         distance_nm
@@ -136,7 +136,7 @@ for ship_id, departure_minute in departure_schedule:
         ship['ship_name'],
         afternoon_departure.isoformat(),
         afternoon_arrival.isoformat(),
-        json.dumps(return_path),
+        orjson.dumps(return_path).decode(),
         10.0,
         'to_docking',
         distance_nm
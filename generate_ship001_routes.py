@@ -5,9 +5,10 @@ Generate routes for SHIP_001 only
 
 import sqlite3
 import json
+import orjson
 from datetime import datetime, timedelta
 from typing import List, Tuple, Optional
-from core_optimizer_latlng import RouteOptimizer, ShipRoute, ObstaclePolygon
+from core_optimizer_latlng import RouteOptimizer, ShipRoute, ObstaclePolygon, path_distance_nm
 import logging
 import os
 
@@ -57,8 +58,8 @@ def create_obstacles():
 
     if os.path.exists(obstacles_file):
         try:
-            with open(obstacles_file, 'r') as f:
-                obstacles_data = json.load(f)
+            with open(obstacles_file, 'rb') as f:
+                obstacles_data = orjson.loads(f.read())
 
             logger.info(f"Loading {len(obstacles_data)} obstacles from {obstacles_file}")
 
@@ -115,7 +116,7 @@ def generate_routes_for_ship001(ship: dict, start_time: datetime):
 
     for row in cursor.fetchall():
         ship_id_db, ship_name, departure_str, path_json, speed = row
-        path = json.loads(path_json)
+        path = orjson.loads(path_json)
         departure_dt = datetime.fromisoformat(departure_str)
 
         # Create ShipRoute object for collision checking
@@ -163,12 +164,7 @@ def generate_routes_for_ship001(ship: dict, start_time: datetime):
         ship_route.calculate_timestamps()
 
         # Calculate arrival time and distance
-        total_distance = 0
-        for j in range(len(departure_path) - 1):
-            from core_optimizer_latlng import haversine_distance
-            dist = haversine_distance(departure_path[j][0], departure_path[j][1],
-                                     departure_path[j+1][0], departure_path[j+1][1])
-            total_distance += dist
+        total_distance = path_distance_nm(departure_path)
 
         # Calculate arrival time (distance / speed = time)
         travel_time_hours = total_distance / 10.0  # 10 knots speed
@@ -212,12 +208,7 @@ def generate_routes_for_ship001(ship: dict, start_time: datetime):
         ship_route.calculate_timestamps()
 
         # Calculate arrival time and distance
-        total_distance = 0
-        for j in range(len(arrival_path) - 1):
-            from core_optimizer_latlng import haversine_distance
-            dist = haversine_distance(arrival_path[j][0], arrival_path[j][1],
-                                     arrival_path[j+1][0], arrival_path[j+1][1])
-            total_distance += dist
+        total_distance = path_distance_nm(arrival_path)
 
         # Calculate arrival time (distance / speed = time)
         travel_time_hours = total_distance / 10.0  # 10 knots speed
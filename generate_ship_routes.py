@@ -6,10 +6,10 @@ Ships 6-10: From fishing area to docking
 """
 
 import sqlite3
-import json
+import orjson
 from datetime import datetime, timedelta
 from typing import List, Tuple, Optional
-from core_optimizer_latlng import RouteOptimizer, ShipRoute, ObstaclePolygon
+from core_optimizer_latlng import RouteOptimizer, ShipRoute, ObstaclePolygon, path_distance_nm
 import logging
 import os
 
@@ -74,8 +74,8 @@ def create_obstacles():
 
     if os.path.exists(obstacles_file):
         try:
-            with open(obstacles_file, 'r') as f:
-                obstacles_data = json.load(f)
+            with open(obstacles_file, 'rb') as f:
+                obstacles_data = orjson.loads(f.read())
 
             logger.info(f"Loading {len(obstacles_data)} obstacles from {obstacles_file}")
 
@@ -179,10 +179,7 @@ def generate_routes(ships: List[dict], start_time: datetime):
             total_distance = ship_route.path_length_nm if hasattr(ship_route, 'path_length_nm') else 0
             if total_distance == 0:
                 # Calculate distance from path
-                for j in range(len(path) - 1):
-                    from core_optimizer_latlng import haversine_distance
-                    dist = haversine_distance(path[j][0], path[j][1], path[j+1][0], path[j+1][1])
-                    total_distance += dist
+                total_distance = path_distance_nm(path)
                 ship_route.path_length_nm = total_distance
 
             # Calculate arrival time (distance / speed = time)
@@ -242,7 +239,7 @@ def save_routes_to_db(routes: List[dict], db_path: str):
             route['ship_name'],
             route['departure_time'],
             route['arrival_time'],
-            json.dumps(route['path']),
+            orjson.dumps(route['path'], option=orjson.OPT_SERIALIZE_NUMPY).decode(),
             route['speed_knots'],
             route['direction'],
             route['total_distance_nm']
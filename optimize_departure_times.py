@@ -6,7 +6,7 @@ Ships can overlap routes as long as they don't collide.
 
 import sqlite3
 from datetime import datetime, timedelta
-import json
+import orjson
 
 def optimize_departure_times():
     conn = sqlite3.connect('ship_routes.db')
@@ -33,7 +33,7 @@ def optimize_departure_times():
     # Update departure times with 5-minute intervals
     for i, route in enumerate(routes):
         ship_id = route[0]
-        path_points = json.loads(route[4])
+        path_points = orjson.loads(route[4])
         speed_knots = route[5]
         total_distance = route[7]
 